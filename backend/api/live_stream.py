@@ -144,11 +144,15 @@ class LiveCameraManager:
         if not self.clients:
             return
         
+        # Serialize once; the base64 frame dominates the payload and is the
+        # same for every client
+        payload = json.dumps(message)
+        
         # Send to all clients, removing disconnected ones
         disconnected = []
         for client in self.clients[:]:  # Copy list to avoid modification during iteration
             try:
-                await client.send_text(json.dumps(message))
+                await client.send_text(payload)
             except WebSocketDisconnect:
                 disconnected.append(client)
             except Exception as e:
@@ -4,11 +4,13 @@ Detection API routes
 Endpoints for querying object detections.
 """
 
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Query, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from typing import Optional, List
 from datetime import datetime
+import json
 
-from backend.database import get_detections
+from backend.database import get_detections, iter_detections
 from ..schemas import DetectionResponse
 
 router = APIRouter(prefix="/detections", tags=["detections"])
@@ -16,12 +18,14 @@ router = APIRouter(prefix="/detections", tags=["detections"])
 
 @router.get("/", response_model=List[DetectionResponse])
 def list_detections(
+    response: Response,
     limit: int = Query(100, ge=1, le=500, description="Maximum number of detections to return"),
     offset: int = Query(0, ge=0, description="Number of detections to skip (pagination)"),
     class_name: Optional[str] = Query(None, description="Filter by object class"),
     min_confidence: Optional[float] = Query(None, ge=0.0, le=1.0, description="Minimum confidence threshold"),
     start_date: Optional[str] = Query(None, description="Filter detections after this date (ISO format)"),
-    end_date: Optional[str] = Query(None, description="Filter detections before this date (ISO format)")
+    end_date: Optional[str] = Query(None, description="Filter detections before this date (ISO format)"),
+    before_id: Optional[int] = Query(None, description="Return detections after this detection ID (keyset pagination)")
 ):
     """
     Get list of detections with optional filtering
@@ -32,23 +36,68 @@ def list_detections(
     - **min_confidence**: Minimum confidence (0.0-1.0)
     - **start_date**: ISO datetime string (e.g., "2025-10-29T00:00:00")
     - **end_date**: ISO datetime string
+    - **before_id**: Last detection ID of the previous page; faster than offset
+      for deep pages. The next cursor is returned in the `X-Next-Before-Id` header
     """
     # Parse dates if provided
     start_dt = datetime.fromisoformat(start_date) if start_date else None
     end_dt = datetime.fromisoformat(end_date) if end_date else None
     
     # Query database
-    detections = get_detections(
-        limit=limit,
-        offset=offset,
+    try:
+        detections = get_detections(
+            limit=limit,
+            offset=offset,
+            class_name=class_name,
+            min_confidence=min_confidence,
+            start_date=start_dt,
+            end_date=end_dt,
+            before_id=before_id
+        )
+    except ValueError as e:
+        # The before_id cursor row was deleted since the previous page
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if len(detections) == limit:
+        response.headers["X-Next-Before-Id"] = str(detections[-1].id)
+    
+    # Convert to response format
+    return [DetectionResponse(**det.to_dict()) for det in detections]
+
+
+@router.get("/export")
+def export_detections(
+    class_name: Optional[str] = Query(None, description="Filter by object class"),
+    min_confidence: Optional[float] = Query(None, ge=0.0, le=1.0, description="Minimum confidence threshold"),
+    start_date: Optional[str] = Query(None, description="Filter detections after this date (ISO format)"),
+    end_date: Optional[str] = Query(None, description="Filter detections before this date (ISO format)")
+):
+    """
+    Export all matching detections as newline-delimited JSON
+    
+    Detections are streamed from the database one at a time, so memory use
+    stays flat no matter how many detections are exported.
+    
+    - **class_name**: Filter by object class (e.g., "coffee_mug", "deer")
+    - **min_confidence**: Minimum confidence (0.0-1.0)
+    - **start_date**: ISO datetime string (e.g., "2025-10-29T00:00:00")
+    - **end_date**: ISO datetime string
+    """
+    # Parse dates if provided
+    start_dt = datetime.fromisoformat(start_date) if start_date else None
+    end_dt = datetime.fromisoformat(end_date) if end_date else None
+    
+    detections = iter_detections(
         class_name=class_name,
         min_confidence=min_confidence,
         start_date=start_dt,
         end_date=end_dt
     )
     
-    # Convert to response format
-    return [DetectionResponse(**det.to_dict()) for det in detections]
+    return StreamingResponse(
+        (json.dumps(det.to_dict()) + "\n" for det in detections),
+        media_type="application/x-ndjson"
+    )
 
 
 @router.get("/classes")
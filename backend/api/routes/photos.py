@@ -4,33 +4,39 @@ Photo API routes
 Endpoints for querying photos and their metadata.
 """
 
-from fastapi import APIRouter, Query, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Query, HTTPException, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from typing import Optional, List
 from datetime import datetime
 from pathlib import Path
+import json
 
 from backend.database import (
-    get_photos, 
+    get_photos_with_detections,
+    iter_photos,
     get_photo, 
     get_detections_for_photo,
+    get_detections_for_photos,
     mark_photo_for_retraining,
+    mark_photos_for_retraining,
     unmark_photo_for_retraining,
     get_marked_photos,
     get_marked_photos_count
 )
-from ..schemas import PhotoResponse, PhotoWithDetections
+from ..schemas import PhotoResponse, PhotoWithDetections, MarkPhotosRequest, MarkPhotosResponse
 
 router = APIRouter(prefix="/photos", tags=["photos"])
 
 
 @router.get("/", response_model=List[PhotoWithDetections])
 def list_photos(
+    response: Response,
     limit: int = Query(100, ge=1, le=500, description="Maximum number of photos to return"),
     offset: int = Query(0, ge=0, description="Number of photos to skip (pagination)"),
     has_detections: Optional[bool] = Query(None, description="Filter by detection presence"),
     start_date: Optional[str] = Query(None, description="Filter photos after this date (ISO format)"),
-    end_date: Optional[str] = Query(None, description="Filter photos before this date (ISO format)")
+    end_date: Optional[str] = Query(None, description="Filter photos before this date (ISO format)"),
+    before_id: Optional[int] = Query(None, description="Return photos after this photo ID (keyset pagination)")
 ):
     """
     Get list of photos with optional filtering
@@ -40,30 +46,63 @@ def list_photos(
     - **has_detections**: Filter by detection presence (true/false)
     - **start_date**: ISO datetime string (e.g., "2025-10-29T00:00:00")
     - **end_date**: ISO datetime string
+    - **before_id**: Last photo ID of the previous page; faster than offset
+      for deep pages. The next cursor is returned in the `X-Next-Before-Id` header
     """
     # Parse dates if provided
     start_dt = datetime.fromisoformat(start_date) if start_date else None
     end_dt = datetime.fromisoformat(end_date) if end_date else None
     
-    # Query database
-    photos = get_photos(
-        limit=limit,
-        offset=offset,
+    # Query database (photos and their detections in two queries)
+    try:
+        photos = get_photos_with_detections(
+            limit=limit,
+            offset=offset,
+            has_detections=has_detections,
+            start_date=start_dt,
+            end_date=end_dt,
+            before_id=before_id
+        )
+    except ValueError as e:
+        # The before_id cursor row was deleted since the previous page
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if len(photos) == limit:
+        response.headers["X-Next-Before-Id"] = str(photos[-1]['id'])
+    
+    return [PhotoWithDetections(**photo_dict) for photo_dict in photos]
+
+
+@router.get("/export")
+def export_photos(
+    has_detections: Optional[bool] = Query(None, description="Filter by detection presence"),
+    start_date: Optional[str] = Query(None, description="Filter photos after this date (ISO format)"),
+    end_date: Optional[str] = Query(None, description="Filter photos before this date (ISO format)")
+):
+    """
+    Export all matching photos as newline-delimited JSON
+    
+    Photos are streamed from the database one at a time, so memory use
+    stays flat no matter how many photos are exported.
+    
+    - **has_detections**: Filter by detection presence (true/false)
+    - **start_date**: ISO datetime string (e.g., "2025-10-29T00:00:00")
+    - **end_date**: ISO datetime string
+    """
+    # Parse dates if provided
+    start_dt = datetime.fromisoformat(start_date) if start_date else None
+    end_dt = datetime.fromisoformat(end_date) if end_date else None
+    
+    photos = iter_photos(
         has_detections=has_detections,
         start_date=start_dt,
         end_date=end_dt
     )
     
-    # Convert to response format with detections
-    result = []
-    for photo in photos:
-        photo_dict = photo.to_dict()
-        # Get detections for this photo
-        detections = get_detections_for_photo(photo.id)
-        photo_dict['detections'] = [det.to_dict() for det in detections]
-        result.append(PhotoWithDetections(**photo_dict))
-    
-    return result
+    return StreamingResponse(
+        (json.dumps(photo.to_dict()) + "\n" for photo in photos),
+        media_type="application/x-ndjson"
+    )
 
 
 @router.get("/{photo_id}", response_model=PhotoWithDetections)
@@ -185,6 +224,25 @@ def unmark_for_retraining(photo_id: int):
     return PhotoWithDetections(**photo_dict)
 
 
+@router.post("/marked/batch", response_model=MarkPhotosResponse)
+def mark_batch_for_retraining(request: MarkPhotosRequest):
+    """
+    Mark several photos for retraining in one request
+    
+    Uploads run in parallel and the database is updated in a single
+    transaction, instead of one round-trip per photo.
+    
+    - **photo_ids**: IDs of photos to mark
+    """
+    marked = mark_photos_for_retraining(request.photo_ids)
+    marked_set = set(marked)
+    
+    return MarkPhotosResponse(
+        marked=marked,
+        failed=[photo_id for photo_id in request.photo_ids if photo_id not in marked_set]
+    )
+
+
 @router.get("/marked/list", response_model=List[PhotoWithDetections])
 def list_marked_photos(
     limit: int = Query(100, ge=1, le=500, description="Maximum number of photos to return"),
@@ -198,11 +256,12 @@ def list_marked_photos(
     """
     photos = get_marked_photos(limit=limit, offset=offset)
     
-    # Add detections to each photo
+    # Fetch detections for the whole page in one query
+    detections_by_photo = get_detections_for_photos(photo_dict['id'] for photo_dict in photos)
+    
     result = []
     for photo_dict in photos:
-        detections = get_detections_for_photo(photo_dict['id'])
-        photo_dict['detections'] = [det.to_dict() for det in detections]
+        photo_dict['detections'] = [det.to_dict() for det in detections_by_photo[photo_dict['id']]]
         result.append(PhotoWithDetections(**photo_dict))
     
     return result
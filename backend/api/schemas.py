@@ -113,6 +113,17 @@ class PhotoWithDetections(PhotoResponse):
         }
 
 
+class MarkPhotosRequest(BaseModel):
+    """Batch mark-for-retraining request"""
+    photo_ids: List[int] = Field(..., min_length=1, max_length=500)
+
+
+class MarkPhotosResponse(BaseModel):
+    """Batch mark-for-retraining result"""
+    marked: List[int]
+    failed: List[int]
+
+
 class SessionResponse(BaseModel):
     """Detection session response"""
     id: int
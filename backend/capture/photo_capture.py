@@ -17,8 +17,7 @@ logger = logging.getLogger(__name__)
 try:
     from backend.database import (
         create_photo,
-        create_detection,
-        update_photo_detections,
+        create_detections_many,
         create_session,
         end_session
     )
@@ -172,21 +171,20 @@ class PhotoCaptureService:
     def _save_detections_to_db(self, photo_id: int, detections: list):
         """Save detections to database"""
         try:
-            for det in detections:
-                bbox_norm = det['bbox_norm']
-                create_detection(
-                    photo_id=photo_id,
-                    class_name=det['class'],
-                    confidence=det['confidence'],
-                    bbox_x=bbox_norm['x'],
-                    bbox_y=bbox_norm['y'],
-                    bbox_width=bbox_norm['width'],
-                    bbox_height=bbox_norm['height'],
-                    model_name=self.model_name
+            rows = [
+                (
+                    det['class'],
+                    det['confidence'],
+                    det['bbox_norm']['x'],
+                    det['bbox_norm']['y'],
+                    det['bbox_norm']['width'],
+                    det['bbox_norm']['height']
                 )
+                for det in detections
+            ]
             
-            # Update photo detection count
-            update_photo_detections(photo_id, len(detections))
+            # Inserts detections and updates the photo's count in one commit
+            create_detections_many(photo_id, rows, model_name=self.model_name)
             logger.debug(f"💾 Saved {len(detections)} detections to database")
         except Exception as e:
             logger.warning(f"⚠️  Failed to save detections to database: {e}")
@@ -29,19 +29,26 @@ from .queries import (
     create_photo,
     get_photo,
     get_photos,
+    iter_photos,
+    get_photos_with_detections,
     update_photo_detections,
     # Detection operations
     create_detection,
+    create_detections_many,
     get_detections_for_photo,
+    get_detections_for_photos,
     get_detections,
+    iter_detections,
     # Session operations
     create_session,
     end_session,
+    end_session_autocount,
     get_sessions,
     # Statistics
     get_detection_stats,
     # Active learning
     mark_photo_for_retraining,
+    mark_photos_for_retraining,
     unmark_photo_for_retraining,
     get_marked_photos,
     get_marked_photos_count,
@@ -59,19 +66,26 @@ __all__ = [
     "create_photo",
     "get_photo",
     "get_photos",
+    "iter_photos",
+    "get_photos_with_detections",
     "update_photo_detections",
     # Detection operations
     "create_detection",
+    "create_detections_many",
     "get_detections_for_photo",
+    "get_detections_for_photos",
     "get_detections",
+    "iter_detections",
     # Session operations
     "create_session",
     "end_session",
+    "end_session_autocount",
     "get_sessions",
     # Statistics
     "get_detection_stats",
     # Active learning
     "mark_photo_for_retraining",
+    "mark_photos_for_retraining",
     "unmark_photo_for_retraining",
     "get_marked_photos",
     "get_marked_photos_count",
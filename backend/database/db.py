@@ -4,31 +4,79 @@ Database connection and initialization module
 Handles SQLite database connection, schema migration, and connection pooling.
 """
 
+import os
+import queue
 import sqlite3
+import threading
+from datetime import datetime
 from pathlib import Path
 from contextlib import contextmanager
 import logging
-from typing import Optional
+from typing import Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
+# Bind datetime parameters as ISO 8601 strings, the format every timestamp
+# column is stored and compared in, so callers can pass datetimes directly
+sqlite3.register_adapter(datetime, datetime.isoformat)
+
 # Default database path
 DEFAULT_DB_PATH = Path("data/detections.db")
 
+# Compiled statements kept per connection (sqlite3 defaults to 128)
+# Note: the stdlib sqlite3 module prepares every statement without
+# SQLITE_PREPARE_PERSISTENT, so cached statements draw on the connection's
+# lookaside memory like ad-hoc ones. Setting that flag would need apsw.
+# That only matters for the writer's handful of hot INSERT/UPDATEs, which
+# doesn't justify a second SQLite binding.
+STATEMENT_CACHE_SIZE = 256
+
+# Maximum number of pooled read connections
+READER_POOL_SIZE = os.cpu_count() or 4
+
+# Seconds to wait for a pooled reader before opening a temporary extra one
+# (long-running streams such as NDJSON exports hold theirs until they finish)
+READER_WAIT_TIMEOUT = 2.0
+
+# Per-connection tuning applied once when a connection is opened
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA synchronous = NORMAL",   # Safe with WAL, one fsync per checkpoint
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",  # 256 MB memory-mapped reads
+)
+
+# WAL pages the writer accumulates before checkpointing back into the main file
+WAL_AUTOCHECKPOINT_PAGES = 1000
+
 
 class Database:
     """SQLite database connection manager"""
     
-    def __init__(self, db_path: Optional[Path] = None):
+    def __init__(self, db_path: Optional[Path] = None, pool_size: int = READER_POOL_SIZE):
         """
         Initialize database connection manager
         
         Args:
             db_path: Path to SQLite database file (default: data/detections.db)
+            pool_size: Maximum number of pooled read connections
         """
         self.db_path = db_path or DEFAULT_DB_PATH
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # Long-lived write connection, so its statement cache survives
+        # across the thousands of identical inserts in a capture session
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.Lock()
+        
+        # Read connections are opened on demand up to pool_size and then
+        # reused; in WAL mode they never block (or wait on) the writer
+        self.pool_size = max(1, pool_size)
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._reader_count = 0
+        self._overflow_readers = set()  # Temporary connections, closed on release
+        self._pool_lock = threading.Lock()
+        
         # Initialize database schema
         self._initialize_schema()
         
@@ -44,7 +92,10 @@ class Database:
         with open(schema_path, 'r') as f:
             schema_sql = f.read()
         
-        with self.get_connection() as conn:
+        with self.get_writer_connection() as conn:
+            # WAL is persistent in the database file, so this only needs to
+            # happen once; readers then proceed while a write is in progress
+            conn.execute("PRAGMA journal_mode = WAL")
             conn.executescript(schema_sql)
             conn.commit()
         
@@ -61,10 +112,74 @@ class Database:
         except Exception as e:
             logger.warning(f"⚠️  Migration runner not available or failed: {e}")
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a configured SQLite connection"""
+        # Connections may be handed to a streaming generator that is
+        # resumed from different worker threads, one step at a time
+        conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        # Return rows as dictionaries
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _acquire_reader(self) -> sqlite3.Connection:
+        """Borrow a read connection, opening one if the pool isn't full yet"""
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._pool_lock:
+            open_new = self._reader_count < self.pool_size
+            if open_new:
+                self._reader_count += 1
+        
+        if not open_new:
+            # Pool exhausted - wait briefly for another handler to return one,
+            # then fall back to a temporary connection rather than blocking
+            # every reader behind slow streams
+            try:
+                return self._readers.get(timeout=READER_WAIT_TIMEOUT)
+            except queue.Empty:
+                logger.warning(f"⚠️  All {self.pool_size} pooled readers busy; opening a temporary connection")
+                conn = self._connect()
+                with self._pool_lock:
+                    self._overflow_readers.add(conn)
+                return conn
+        
+        try:
+            return self._connect()
+        except Exception:
+            with self._pool_lock:
+                self._reader_count -= 1
+            raise
+    
+    def _release_reader(self, conn: sqlite3.Connection):
+        """Return a read connection to the pool (temporary ones are closed)"""
+        with self._pool_lock:
+            overflow = conn in self._overflow_readers
+            self._overflow_readers.discard(conn)
+        if overflow:
+            conn.close()
+            return
+        
+        # Don't hand the next borrower an open transaction (and its snapshot)
+        if conn.in_transaction:
+            conn.rollback()
+        self._readers.put(conn)
+    
     @contextmanager
     def get_connection(self):
         """
-        Context manager for database connections
+        Context manager for pooled read connections
+        
+        Connections are borrowed from a pool and returned on exit rather
+        than closed. Writes should go through get_writer_connection().
         
         Usage:
             with db.get_connection() as conn:
@@ -74,22 +189,61 @@ class Database:
         Yields:
             sqlite3.Connection: Database connection
         """
-        conn = None
+        conn = self._acquire_reader()
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            # Enable foreign keys
-            conn.execute("PRAGMA foreign_keys = ON")
-            # Return rows as dictionaries
-            conn.row_factory = sqlite3.Row
             yield conn
         except sqlite3.Error as e:
-            if conn:
-                conn.rollback()
             logger.error(f"❌ Database error: {e}")
             raise
         finally:
-            if conn:
-                conn.close()
+            self._release_reader(conn)
+    
+    @contextmanager
+    def get_writer_connection(self):
+        """
+        Context manager for the shared write connection
+        
+        The connection is opened once and reused, so SQLite's per-connection
+        statement cache keeps hot INSERT/UPDATE statements compiled. Access
+        is serialized with a lock (SQLite allows a single writer anyway).
+        
+        Usage:
+            with db.get_writer_connection() as conn:
+                conn.execute("INSERT INTO ...", params)
+                conn.commit()
+        
+        Yields:
+            sqlite3.Connection: Database connection
+        """
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+                # Only the writer commits, so it is the one that checkpoints
+                self._writer.execute(f"PRAGMA wal_autocheckpoint = {WAL_AUTOCHECKPOINT_PAGES}")
+            try:
+                yield self._writer
+            except Exception as e:
+                # Never leave a half-finished transaction on the shared connection
+                self._writer.rollback()
+                if isinstance(e, sqlite3.Error):
+                    logger.error(f"❌ Database error: {e}")
+                raise
+    
+    def close(self):
+        """Close the shared write connection and all idle pooled readers"""
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        
+        while True:
+            try:
+                conn = self._readers.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._pool_lock:
+                self._reader_count -= 1
     
     def execute_query(self, query: str, params: tuple = ()):
         """
@@ -107,6 +261,23 @@ class Database:
             cursor.execute(query, params)
             return cursor.fetchall()
     
+    def iter_query(self, query: str, params: tuple = ()) -> Iterator[sqlite3.Row]:
+        """
+        Execute a query and yield rows one at a time
+        
+        The connection stays open until the generator is exhausted or
+        closed, so large result sets are never materialized in memory.
+        
+        Args:
+            query: SQL query string
+            params: Query parameters
+        
+        Yields:
+            Row objects
+        """
+        with self.get_connection() as conn:
+            yield from conn.execute(query, params)
+    
     def execute_insert(self, query: str, params: tuple = ()) -> int:
         """
         Execute an INSERT query and return the last row ID
@@ -118,7 +289,7 @@ class Database:
         Returns:
             Last inserted row ID
         """
-        with self.get_connection() as conn:
+        with self.get_writer_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
             conn.commit()
@@ -135,7 +306,7 @@ class Database:
         Returns:
             Number of affected rows
         """
-        with self.get_connection() as conn:
+        with self.get_writer_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
             conn.commit()
@@ -159,19 +330,18 @@ class Database:
             cursor.execute("SELECT COUNT(*) FROM photos WHERE has_detections = 1")
             photos_with_detections = cursor.fetchone()[0]
             
-            # Total detections
-            cursor.execute("SELECT COUNT(*) FROM detections")
-            total_detections = cursor.fetchone()[0]
-            
-            # Detection classes
+            # Detection classes, from the trigger-maintained rollup (one
+            # row per class) instead of a GROUP BY over every detection
             cursor.execute("""
-                SELECT class_name, COUNT(*) as count 
-                FROM detections 
-                GROUP BY class_name 
-                ORDER BY count DESC
+                SELECT class_name, detection_count 
+                FROM stats_rollup 
+                ORDER BY detection_count DESC
             """)
             classes = [{"class_name": row[0], "count": row[1]} for row in cursor.fetchall()]
             
+            # Total detections
+            total_detections = sum(cls["count"] for cls in classes)
+            
             # Calculate average detections per photo
             avg_detections_per_photo = (
                 total_detections / total_photos if total_photos > 0 else 0.0
@@ -0,0 +1,11 @@
+-- Migration: Replace the marked_for_retraining index with a partial index
+-- Only a handful of photos are ever marked, so indexing every row wastes
+-- space. The partial index holds just the marked rows, which lets SQLite
+-- answer the marked count and the marked list (ordered by marked_at)
+-- without scanning the photos table
+
+-- Add partial index covering only marked photos
+CREATE INDEX IF NOT EXISTS idx_photos_marked ON photos(marked_at) WHERE marked_for_retraining = 1;
+
+-- Drop the full-table index it supersedes
+DROP INDEX IF EXISTS idx_photos_marked_for_retraining
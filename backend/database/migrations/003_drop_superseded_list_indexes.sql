@@ -0,0 +1,11 @@
+-- Migration: Drop single-column indexes superseded by the composite
+-- list-query indexes in schema.sql
+-- idx_photos_captured_has_det, idx_detections_created_class_conf and
+-- idx_detections_class_created start with the same columns, so these
+-- only cost extra writes on every insert
+
+DROP INDEX IF EXISTS idx_photos_captured_at;
+
+DROP INDEX IF EXISTS idx_detections_created_at;
+
+DROP INDEX IF EXISTS idx_detections_class_name
@@ -0,0 +1,9 @@
+-- Migration: Backfill per-class detection counts
+-- stats_rollup and its triggers are created by schema.sql, since trigger
+-- bodies contain semicolons and this runner splits statements on them.
+-- This seeds the counts for detections recorded before the triggers existed
+
+DELETE FROM stats_rollup;
+
+INSERT INTO stats_rollup (class_name, detection_count)
+SELECT class_name, COUNT(*) FROM detections GROUP BY class_name
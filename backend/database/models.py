@@ -9,20 +9,46 @@ from datetime import datetime
 from typing import Optional, List
 
 
-@dataclass
+def _to_iso(value: Optional[str]) -> Optional[str]:
+    """Normalize a stored timestamp string to ISO 8601 ('T' separator)"""
+    # SQLite's CURRENT_TIMESTAMP default uses a space separator
+    return value.replace(" ", "T", 1) if value else None
+
+
+@dataclass(slots=True)
 class Photo:
-    """Photo record from database"""
+    """
+    Photo record from database
+    
+    Fields are declared in PHOTO_COLUMNS order, so list queries build
+    records with Photo(*row); from_row handles SELECT * and older schemas.
+    """
     id: Optional[int]
     filename: str
     filepath: str
     width: Optional[int]
     height: Optional[int]
-    captured_at: datetime
+    captured_at_iso: str
     has_detections: bool
     detection_count: int
-    created_at: datetime
+    created_at_iso: str
     marked_for_retraining: bool = False
-    marked_at: Optional[datetime] = None
+    marked_at_iso: Optional[str] = None
+    
+    @property
+    def captured_at(self) -> datetime:
+        """Capture time, parsed on demand"""
+        return datetime.fromisoformat(self.captured_at_iso)
+    
+    @property
+    def created_at(self) -> datetime:
+        """Record creation time, parsed on demand"""
+        return datetime.fromisoformat(self.created_at_iso)
+    
+    @property
+    def marked_at(self) -> Optional[datetime]:
+        """Time the photo was marked for retraining, parsed on demand"""
+        return datetime.fromisoformat(self.marked_at_iso) if self.marked_at_iso else None
     
     @classmethod
     def from_row(cls, row) -> 'Photo':
@@ -34,9 +60,9 @@ class Photo:
             marked_for_retraining = False
         
         try:
-            marked_at = datetime.fromisoformat(row['marked_at']) if row['marked_at'] else None
+            marked_at_iso = _to_iso(row['marked_at'])
         except (KeyError, IndexError):
-            marked_at = None
+            marked_at_iso = None
         
         return cls(
             id=row['id'],
@@ -44,12 +70,12 @@ class Photo:
             filepath=row['filepath'],
             width=row['width'],
             height=row['height'],
-            captured_at=datetime.fromisoformat(row['captured_at']),
+            captured_at_iso=_to_iso(row['captured_at']),
             has_detections=bool(row['has_detections']),
             detection_count=row['detection_count'],
-            created_at=datetime.fromisoformat(row['created_at']),
+            created_at_iso=_to_iso(row['created_at']),
             marked_for_retraining=marked_for_retraining,
-            marked_at=marked_at
+            marked_at_iso=marked_at_iso
         )
     
     def to_dict(self) -> dict:
@@ -60,18 +86,24 @@ class Photo:
             "filepath": self.filepath,
             "width": self.width,
             "height": self.height,
-            "captured_at": self.captured_at.isoformat(),
-            "has_detections": self.has_detections,
+            "captured_at": self.captured_at_iso,
+            # SQLite returns BOOLEAN columns as 0/1 for Photo(*row) records
+            "has_detections": bool(self.has_detections),
             "detection_count": self.detection_count,
-            "created_at": self.created_at.isoformat(),
-            "marked_for_retraining": self.marked_for_retraining,
-            "marked_at": self.marked_at.isoformat() if self.marked_at else None
+            "created_at": self.created_at_iso,
+            "marked_for_retraining": bool(self.marked_for_retraining),
+            "marked_at": self.marked_at_iso
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Detection:
-    """Detection record from database"""
+    """
+    Detection record from database
+    
+    Fields are declared in DETECTION_COLUMNS order, so list queries build
+    records with Detection(*row).
+    """
     id: Optional[int]
     photo_id: int
     class_name: str
@@ -81,7 +113,12 @@ class Detection:
     bbox_width: float
     bbox_height: float
     model_name: Optional[str]
-    created_at: datetime
+    created_at_iso: str
+    
+    @property
+    def created_at(self) -> datetime:
+        """Record creation time, parsed on demand"""
+        return datetime.fromisoformat(self.created_at_iso)
     
     @classmethod
     def from_row(cls, row) -> 'Detection':
@@ -96,7 +133,7 @@ class Detection:
             bbox_width=row['bbox_width'],
             bbox_height=row['bbox_height'],
             model_name=row['model_name'] if row['model_name'] else None,
-            created_at=datetime.fromisoformat(row['created_at'])
+            created_at_iso=_to_iso(row['created_at'])
         )
     
     def to_dict(self) -> dict:
@@ -126,11 +163,11 @@ class Detection:
                 "y_max": y_max
             },
             "model_name": self.model_name,
-            "created_at": self.created_at.isoformat()
+            "created_at": self.created_at_iso
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DetectionSession:
     """Detection session record from database"""
     id: Optional[int]
@@ -14,16 +14,22 @@ __all__ = [
     'create_photo',
     'get_photo',
     'get_photos',
+    'iter_photos',
+    'get_photos_with_detections',
     'update_photo_detections',
     
     # Detection operations
     'create_detection',
+    'create_detections_many',
     'get_detections_for_photo',
+    'get_detections_for_photos',
     'get_detections',
+    'iter_detections',
     
     # Session operations
     'create_session',
     'end_session',
+    'end_session_autocount',
     'get_sessions',
     
     # Statistics
@@ -8,18 +8,24 @@ from .photos import (
     create_photo,
     get_photo,
     get_photos,
+    iter_photos,
+    get_photos_with_detections,
     update_photo_detections
 )
 
 from .detections import (
     create_detection,
+    create_detections_many,
     get_detections_for_photo,
-    get_detections
+    get_detections_for_photos,
+    get_detections,
+    iter_detections
 )
 
 from .sessions import (
     create_session,
     end_session,
+    end_session_autocount,
     get_sessions
 )
 
@@ -29,6 +35,7 @@ from .stats import (
 
 from .active_learning import (
     mark_photo_for_retraining,
+    mark_photos_for_retraining,
     unmark_photo_for_retraining,
     get_marked_photos,
     get_marked_photos_count
@@ -39,16 +46,22 @@ __all__ = [
     'create_photo',
     'get_photo',
     'get_photos',
+    'iter_photos',
+    'get_photos_with_detections',
     'update_photo_detections',
     
     # Detection operations
     'create_detection',
+    'create_detections_many',
     'get_detections_for_photo',
+    'get_detections_for_photos',
     'get_detections',
+    'iter_detections',
     
     # Session operations
     'create_session',
     'end_session',
+    'end_session_autocount',
     'get_sessions',
     
     # Statistics
@@ -56,6 +69,7 @@ __all__ = [
     
     # Active learning
     'mark_photo_for_retraining',
+    'mark_photos_for_retraining',
     'unmark_photo_for_retraining',
     'get_marked_photos',
     'get_marked_photos_count',
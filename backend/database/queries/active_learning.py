@@ -8,21 +8,32 @@ import logging
 import os
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
-
-from dotenv import load_dotenv
-from azure.storage.blob import BlobServiceClient, ContentSettings
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from ..db import get_db
+from .photos import PHOTO_SELECT
 
-# Load environment variables
-load_dotenv()
+if TYPE_CHECKING:
+    from azure.storage.blob import BlobServiceClient
 
 logger = logging.getLogger(__name__)
 
 
-def _get_blob_service_client() -> Optional[BlobServiceClient]:
+@lru_cache(maxsize=None)
+def _load_env():
+    """Load environment variables from .env (once, on first use)"""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def _get_blob_service_client() -> Optional["BlobServiceClient"]:
     """Get Azure Blob Storage client"""
+    # Azure SDK is heavy to import; only pay for it when uploading
+    from azure.storage.blob import BlobServiceClient
+    
+    _load_env()
     connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
     
     if not connection_string:
@@ -36,32 +47,50 @@ def _get_blob_service_client() -> Optional[BlobServiceClient]:
         return None
 
 
-def _upload_to_blob_storage(photo_path: Path, photo_filename: str) -> bool:
+def _get_container_client():
+    """
+    Get the retraining container client, creating the container if needed
+    
+    Returns:
+        ContainerClient, or None if Azure is not configured
+    """
+    blob_client_service = _get_blob_service_client()
+    if not blob_client_service:
+        return None
+    
+    container_name = os.getenv("AZURE_STORAGE_CONTAINER_NAME", "retraining-photos")
+    
+    # Get container client (create container if it doesn't exist)
+    container_client = blob_client_service.get_container_client(container_name)
+    try:
+        container_client.create_container()
+        logger.info(f"📦 Created container: {container_name}")
+    except Exception:
+        # Container already exists, that's fine
+        pass
+    
+    return container_client
+
+
+def _upload_to_blob_storage(photo_path: Path, photo_filename: str, container_client=None) -> bool:
     """
     Upload photo to Azure Blob Storage
     
     Args:
         photo_path: Local path to photo file
         photo_filename: Name of the file
+        container_client: Existing container client to reuse (optional)
     
     Returns:
         True if successful, False otherwise
     """
-    blob_client_service = _get_blob_service_client()
-    if not blob_client_service:
-        return False
-    
-    container_name = os.getenv("AZURE_STORAGE_CONTAINER_NAME", "retraining-photos")
+    from azure.storage.blob import ContentSettings
     
     try:
-        # Get container client (create container if it doesn't exist)
-        container_client = blob_client_service.get_container_client(container_name)
-        try:
-            container_client.create_container()
-            logger.info(f"📦 Created container: {container_name}")
-        except Exception:
-            # Container already exists, that's fine
-            pass
+        if container_client is None:
+            container_client = _get_container_client()
+            if not container_client:
+                return False
         
         # Upload file
         blob_client = container_client.get_blob_client(photo_filename)
@@ -75,7 +104,10 @@ def _upload_to_blob_storage(photo_path: Path, photo_filename: str) -> bool:
         
         logger.info(f"☁️  Uploaded {photo_filename} to Azure Blob Storage")
         return True
-        
+    
+    except FileNotFoundError:
+        logger.error(f"❌ Photo file not found: {photo_path}")
+        return False
     except Exception as e:
         logger.error(f"❌ Failed to upload to blob storage: {e}")
         return False
@@ -102,74 +134,146 @@ def mark_photo_for_retraining(photo_id: int) -> bool:
                 (photo_id,)
             )
             photo = cursor.fetchone()
-            
-            if not photo:
-                logger.warning(f"⚠️  Photo {photo_id} not found")
-                return False
-            
-            # Check if already marked
-            if photo['marked_for_retraining']:
-                logger.info(f"ℹ️  Photo {photo_id} already marked for retraining")
-                return True
-            
-            # Check if photo file exists
-            source_path = Path(photo['filepath'])
-            if not source_path.exists():
-                logger.error(f"❌ Photo file not found: {source_path}")
-                return False
-            
-            # Upload to Azure Blob Storage
-            if not _upload_to_blob_storage(source_path, photo['filename']):
-                logger.error(f"❌ Failed to upload {photo['filename']} to cloud storage")
-                return False
-            
-            # Update database
-            cursor.execute(
-                """
-                UPDATE photos 
-                SET marked_for_retraining = 1, marked_at = ? 
-                WHERE id = ?
-                """,
-                (datetime.now().isoformat(), photo_id)
-            )
-            conn.commit()
-            
-            logger.info(f"✅ Marked photo {photo_id} for retraining and uploaded to cloud")
+        
+        if not photo:
+            logger.warning(f"⚠️  Photo {photo_id} not found")
+            return False
+        
+        # Check if already marked
+        if photo['marked_for_retraining']:
+            logger.info(f"ℹ️  Photo {photo_id} already marked for retraining")
             return True
         
+        # Upload to Azure Blob Storage (a missing file fails the open)
+        if not _upload_to_blob_storage(Path(photo['filepath']), photo['filename']):
+            logger.error(f"❌ Failed to upload {photo['filename']} to cloud storage")
+            return False
+        
+        # Update database
+        db.execute_update(
+            """
+            UPDATE photos 
+            SET marked_for_retraining = 1, marked_at = ? 
+            WHERE id = ?
+            """,
+            (datetime.now(), photo_id)
+        )
+        
+        logger.info(f"✅ Marked photo {photo_id} for retraining and uploaded to cloud")
+        return True
+    
     except Exception as e:
         logger.error(f"❌ Failed to mark photo for retraining: {e}")
         return False
 
 
-def unmark_photo_for_retraining(photo_id: int) -> bool:
+def mark_photos_for_retraining(photo_ids: List[int], max_workers: int = 8) -> List[int]:
     """
-    Unmark a photo for retraining (does not delete from to_annotate folder)
+    Mark several photos for retraining in one batch
+    
+    Fetches all photos with a single query, uploads them to Azure Blob
+    Storage in parallel, then records every successful upload in one
+    transaction.
     
     Args:
-        photo_id: ID of the photo to unmark
+        photo_ids: IDs of the photos to mark
+        max_workers: Maximum number of concurrent uploads
     
     Returns:
-        True if successful, False otherwise
+        IDs of photos that are now marked (including already-marked ones)
     """
+    if not photo_ids:
+        return []
+    
     db = get_db()
     
     try:
         with db.get_connection() as conn:
             cursor = conn.cursor()
+            placeholders = ",".join("?" * len(photo_ids))
             cursor.execute(
+                f"SELECT id, filepath, filename, marked_for_retraining FROM photos WHERE id IN ({placeholders})",
+                tuple(photo_ids)
+            )
+            photos = cursor.fetchall()
+        
+        found_ids = {photo['id'] for photo in photos}
+        for photo_id in photo_ids:
+            if photo_id not in found_ids:
+                logger.warning(f"⚠️  Photo {photo_id} not found")
+        
+        already_marked = [photo['id'] for photo in photos if photo['marked_for_retraining']]
+        to_upload = [
+            (photo['id'], Path(photo['filepath']), photo['filename'])
+            for photo in photos
+            if not photo['marked_for_retraining']
+        ]
+        
+        if not to_upload:
+            return already_marked
+        
+        container_client = _get_container_client()
+        if not container_client:
+            logger.error("❌ Failed to connect to cloud storage")
+            return already_marked
+        
+        # Uploads are network-bound, so threads overlap them well
+        uploaded = []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(to_upload))) as executor:
+            futures = {
+                executor.submit(_upload_to_blob_storage, path, filename, container_client): photo_id
+                for photo_id, path, filename in to_upload
+            }
+            for future in as_completed(futures):
+                if future.result():
+                    uploaded.append(futures[future])
+        
+        # Record all successful uploads in a single transaction
+        marked_at = datetime.now()
+        with db.get_writer_connection() as conn:
+            conn.executemany(
                 """
                 UPDATE photos 
-                SET marked_for_retraining = 0, marked_at = NULL 
+                SET marked_for_retraining = 1, marked_at = ? 
                 WHERE id = ?
                 """,
-                (photo_id,)
+                [(marked_at, photo_id) for photo_id in uploaded]
             )
             conn.commit()
-            
-            logger.info(f"✅ Unmarked photo {photo_id} for retraining")
-            return True
         
+        logger.info(f"✅ Marked {len(uploaded)}/{len(to_upload)} photos for retraining and uploaded to cloud")
+        return already_marked + uploaded
+    
+    except Exception as e:
+        logger.error(f"❌ Failed to mark photos for retraining: {e}")
+        return []
+
+
+def unmark_photo_for_retraining(photo_id: int) -> bool:
+    """
+    Unmark a photo for retraining (does not delete from to_annotate folder)
+    
+    Args:
+        photo_id: ID of the photo to unmark
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    db = get_db()
+    
+    try:
+        db.execute_update(
+            """
+            UPDATE photos 
+            SET marked_for_retraining = 0, marked_at = NULL 
+            WHERE id = ?
+            """,
+            (photo_id,)
+        )
+        
+        logger.info(f"✅ Unmarked photo {photo_id} for retraining")
+        return True
+    
     except Exception as e:
         logger.error(f"❌ Failed to unmark photo for retraining: {e}")
         return False
@@ -188,10 +292,10 @@ def get_marked_photos(limit: Optional[int] = None, offset: int = 0):
     """
     db = get_db()
     
-    query = """
-        SELECT * FROM photos 
+    query = f"""
+        SELECT {PHOTO_SELECT} FROM photos 
         WHERE marked_for_retraining = 1 
-        ORDER BY marked_at DESC
+        ORDER BY photos.marked_at DESC
     """
     
     if limit:
@@ -203,7 +307,7 @@ def get_marked_photos(limit: Optional[int] = None, offset: int = 0):
         rows = cursor.fetchall()
     
     from ..models import Photo
-    return [Photo.from_row(row).to_dict() for row in rows]
+    return [Photo(*row).to_dict() for row in rows]
 
 
 def get_marked_photos_count() -> int:
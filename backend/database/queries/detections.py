@@ -3,14 +3,67 @@ Detection-related database queries
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import logging
 
 from ..db import get_db
 from ..models import Detection
+from .photos import _UPDATE_PHOTO_DETECTIONS_SQL, _filter_variants
+from .stats import invalidate_stats_cache
 
 logger = logging.getLogger(__name__)
 
+# Columns read by list queries, in Detection field order so each row
+# unpacks straight into Detection(*row)
+DETECTION_COLUMNS = (
+    "id",
+    "photo_id",
+    "class_name",
+    "confidence",
+    "bbox_x",
+    "bbox_y",
+    "bbox_width",
+    "bbox_height",
+    "NULLIF(model_name, '') AS model_name",
+    "replace(created_at, ' ', 'T') AS created_at",
+)
+DETECTION_SELECT = ", ".join(DETECTION_COLUMNS)
+
+# Hot-path SQL kept as constants so the writer connection's statement
+# cache hits on every call
+_CREATE_DETECTION_SQL = """
+    INSERT INTO detections 
+    (photo_id, class_name, confidence, bbox_x, bbox_y, bbox_width, bbox_height, model_name)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Optional list filters, in bitmask order
+_DETECTION_FILTERS = (
+    "class_name = ?",
+    "confidence >= ?",
+    "created_at >= ?",
+    "created_at <= ?",
+    # Seek past the previous page's last row using the (created_at, id)
+    # sort key, so each page is an index range scan instead of OFFSET
+    "(created_at, id) < (?, ?)",
+)
+
+# Sort key of the keyset cursor row, looked up before the page query so a
+# deleted cursor row is reported instead of silently matching nothing
+_CURSOR_SORT_KEY_SQL = "SELECT created_at FROM detections WHERE id = ?"
+
+# Every filter combination is built once at import, so each call reuses
+# an identical SQL string instead of assembling a WHERE clause
+_LIST_DETECTIONS_SQL = _filter_variants(
+    f"""
+        SELECT {DETECTION_SELECT} FROM detections
+        {{where_clause}}
+        ORDER BY detections.created_at DESC, detections.id DESC
+        LIMIT ? OFFSET ?
+    """,
+    _DETECTION_FILTERS
+)
+
 
 def create_detection(
     photo_id: int,
@@ -40,21 +93,51 @@ def create_detection(
     """
     db = get_db()
     
-    query = """
-        INSERT INTO detections 
-        (photo_id, class_name, confidence, bbox_x, bbox_y, bbox_width, bbox_height, model_name)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """
-    
     detection_id = db.execute_insert(
-        query,
+        _CREATE_DETECTION_SQL,
         (photo_id, class_name, confidence, bbox_x, bbox_y, bbox_width, bbox_height, model_name)
     )
+    invalidate_stats_cache()
     
     logger.debug(f"📝 Created detection: {class_name} ({confidence:.2%}) for photo {photo_id}")
     return detection_id
 
 
+def create_detections_many(
+    photo_id: int,
+    rows: List[Tuple[str, float, float, float, float, float]],
+    model_name: Optional[str] = None
+) -> int:
+    """
+    Insert all detections for a photo and update its count in one transaction
+    
+    Args:
+        photo_id: Associated photo ID
+        rows: (class_name, confidence, bbox_x, bbox_y, bbox_width, bbox_height)
+            tuples, with bbox values normalized
+        model_name: Name of model used
+    
+    Returns:
+        Number of detections inserted
+    """
+    db = get_db()
+    
+    params = [(photo_id, *row, model_name) for row in rows]
+    
+    # One commit for the whole frame instead of one per detection
+    with db.get_writer_connection() as conn:
+        with conn:
+            conn.executemany(_CREATE_DETECTION_SQL, params)
+            conn.execute(
+                _UPDATE_PHOTO_DETECTIONS_SQL,
+                (1 if params else 0, len(params), photo_id)
+            )
+    invalidate_stats_cache()
+    
+    logger.debug(f"📝 Created {len(params)} detections for photo {photo_id}")
+    return len(params)
+
+
 def get_detections_for_photo(photo_id: int) -> List[Detection]:
     """
     Get all detections for a specific photo
@@ -66,65 +149,140 @@ def get_detections_for_photo(photo_id: int) -> List[Detection]:
         List of Detection objects
     """
     db = get_db()
-    query = "SELECT * FROM detections WHERE photo_id = ? ORDER BY confidence DESC"
+    query = f"SELECT {DETECTION_SELECT} FROM detections WHERE photo_id = ? ORDER BY confidence DESC"
     rows = db.execute_query(query, (photo_id,))
     
-    return [Detection.from_row(row) for row in rows]
+    return [Detection(*row) for row in rows]
 
 
-def get_detections(
-    limit: int = 100,
+def get_detections_for_photos(photo_ids: Iterable[int]) -> Dict[int, List[Detection]]:
+    """
+    Get detections for several photos with a single query
+    
+    Args:
+        photo_ids: Photo IDs
+    
+    Returns:
+        Dictionary mapping each photo ID to its detections (highest
+        confidence first); photos without detections map to an empty list
+    """
+    photo_ids = list(photo_ids)
+    grouped: Dict[int, List[Detection]] = {photo_id: [] for photo_id in photo_ids}
+    
+    if not photo_ids:
+        return grouped
+    
+    db = get_db()
+    placeholders = ",".join("?" * len(photo_ids))
+    query = f"""
+        SELECT {DETECTION_SELECT} FROM detections
+        WHERE photo_id IN ({placeholders})
+        ORDER BY photo_id, confidence DESC
+    """
+    
+    for row in db.iter_query(query, tuple(photo_ids)):
+        grouped[row['photo_id']].append(Detection(*row))
+    
+    return grouped
+
+
+def iter_detections(
+    limit: Optional[int] = None,
     offset: int = 0,
     class_name: Optional[str] = None,
     min_confidence: Optional[float] = None,
     start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None
-) -> List[Detection]:
+    end_date: Optional[datetime] = None,
+    before_id: Optional[int] = None
+) -> Iterator[Detection]:
     """
-    Get detections with optional filtering
+    Stream detections with optional filtering
+    
+    Rows are read from the cursor as they are consumed, so memory stays
+    constant regardless of how many detections match.
     
     Args:
-        limit: Maximum number of detections to return
+        limit: Maximum number of detections to yield (None for all)
         offset: Number of detections to skip (pagination)
         class_name: Filter by class name
         min_confidence: Minimum confidence threshold
         start_date: Filter detections after this date
         end_date: Filter detections before this date
+        before_id: Keyset cursor; only return detections that sort after this ID
+            (the last ID of the previous page). Prefer over offset for deep pages.
+            Raises ValueError if that detection no longer exists
     
-    Returns:
-        List of Detection objects
+    Yields:
+        Detection objects
     """
     db = get_db()
     
-    conditions = []
+    mask = 0
     params = []
     
     if class_name:
-        conditions.append("class_name = ?")
+        mask |= 1
         params.append(class_name)
     
     if min_confidence is not None:
-        conditions.append("confidence >= ?")
+        mask |= 2
         params.append(min_confidence)
     
     if start_date:
-        conditions.append("created_at >= ?")
-        params.append(start_date.isoformat())
+        mask |= 4
+        params.append(start_date)
     
     if end_date:
-        conditions.append("created_at <= ?")
-        params.append(end_date.isoformat())
+        mask |= 8
+        params.append(end_date)
     
-    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    if before_id is not None:
+        cursor_rows = db.execute_query(_CURSOR_SORT_KEY_SQL, (before_id,))
+        if not cursor_rows:
+            raise ValueError(f"Pagination cursor detection {before_id} no longer exists")
+        mask |= 16
+        params.extend([cursor_rows[0]['created_at'], before_id])
     
-    query = f"""
-        SELECT * FROM detections
-        {where_clause}
-        ORDER BY created_at DESC
-        LIMIT ? OFFSET ?
+    query = _LIST_DETECTIONS_SQL[mask]
+    
+    # SQLite treats a negative LIMIT as "no limit"
+    params.extend([limit if limit is not None else -1, offset])
+    
+    for row in db.iter_query(query, tuple(params)):
+        yield Detection(*row)
+
+
+def get_detections(
+    limit: int = 100,
+    offset: int = 0,
+    class_name: Optional[str] = None,
+    min_confidence: Optional[float] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    before_id: Optional[int] = None
+) -> List[Detection]:
     """
+    Get detections with optional filtering
     
-    params.extend([limit, offset])
-    rows = db.execute_query(query, tuple(params))
+    Args:
+        limit: Maximum number of detections to return
+        offset: Number of detections to skip (pagination)
+        class_name: Filter by class name
+        min_confidence: Minimum confidence threshold
+        start_date: Filter detections after this date
+        end_date: Filter detections before this date
+        before_id: Keyset cursor; only return detections that sort after this ID
+            (the last ID of the previous page). Prefer over offset for deep pages
     
-    return [Detection.from_row(row) for row in rows]
+    Returns:
+        List of Detection objects
+    """
+    return list(iter_detections(
+        limit=limit,
+        offset=offset,
+        class_name=class_name,
+        min_confidence=min_confidence,
+        start_date=start_date,
+        end_date=end_date,
+        before_id=before_id
+    ))
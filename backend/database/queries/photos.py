@@ -4,21 +4,99 @@ Photo-related database queries
 
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 import logging
 
 from ..db import get_db
 from ..models import Photo
+from .stats import invalidate_stats_cache
 
 logger = logging.getLogger(__name__)
 
+# Columns read by list queries, in Photo field order so each row unpacks
+# straight into Photo(*row). Timestamps are normalized to ISO 8601 in SQL
+# (CURRENT_TIMESTAMP defaults use a space separator)
+PHOTO_COLUMNS = (
+    "id",
+    "filename",
+    "filepath",
+    "width",
+    "height",
+    "replace(captured_at, ' ', 'T') AS captured_at",
+    "has_detections",
+    "detection_count",
+    "replace(created_at, ' ', 'T') AS created_at",
+    "marked_for_retraining",
+    "replace(marked_at, ' ', 'T') AS marked_at",
+)
+PHOTO_SELECT = ", ".join(PHOTO_COLUMNS)
+
+# Hot-path SQL kept as constants so the writer connection's statement
+# cache hits on every call
+_CREATE_PHOTO_SQL = """
+    INSERT INTO photos (filename, filepath, width, height, captured_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_UPDATE_PHOTO_DETECTIONS_SQL = """
+    UPDATE photos 
+    SET has_detections = ?, detection_count = ?
+    WHERE id = ?
+"""
+
+
+def _filter_variants(template: str, filters: Tuple[str, ...]) -> Dict[int, str]:
+    """
+    Pre-build a query for every combination of optional filters
+    
+    Args:
+        template: SQL with a {where_clause} placeholder
+        filters: Filter conditions; bit i of the key enables filters[i]
+    
+    Returns:
+        Dictionary mapping filter bitmask to finished SQL
+    """
+    variants = {}
+    for mask in range(1 << len(filters)):
+        conditions = [condition for bit, condition in enumerate(filters) if mask & (1 << bit)]
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        variants[mask] = template.format(where_clause=where_clause)
+    return variants
+
+
+# Optional list filters, in bitmask order
+_PHOTO_FILTERS = (
+    "has_detections = ?",
+    "captured_at >= ?",
+    "captured_at <= ?",
+    # Seek past the previous page's last row using the (captured_at, id)
+    # sort key, so each page is an index range scan instead of OFFSET
+    "(captured_at, id) < (?, ?)",
+)
+
+# Sort key of the keyset cursor row, looked up before the page query so a
+# deleted cursor row is reported instead of silently matching nothing
+_CURSOR_SORT_KEY_SQL = "SELECT captured_at FROM photos WHERE id = ?"
+
+# Every filter combination is built once at import, so each call reuses
+# an identical SQL string instead of assembling a WHERE clause
+_LIST_PHOTOS_SQL = _filter_variants(
+    f"""
+        SELECT {PHOTO_SELECT} FROM photos
+        {{where_clause}}
+        ORDER BY photos.captured_at DESC, photos.id DESC
+        LIMIT ? OFFSET ?
+    """,
+    _PHOTO_FILTERS
+)
+
 
 def create_photo(
     filename: str,
     filepath: str,
     width: Optional[int] = None,
     height: Optional[int] = None,
-    captured_at: Optional[datetime] = None
+    captured_at: Optional[Union[datetime, str]] = None
 ) -> int:
     """
     Insert a new photo record
@@ -28,25 +106,22 @@ def create_photo(
         filepath: Full path to photo
         width: Image width in pixels
         height: Image height in pixels
-        captured_at: Timestamp when captured
+        captured_at: Timestamp when captured (datetime or ISO string)
     
     Returns:
         Photo ID
     """
     db = get_db()
     
+    # datetimes bind as ISO strings (see db.py), which Photo.to_dict returns as-is
     if captured_at is None:
         captured_at = datetime.now()
     
-    query = """
-        INSERT INTO photos (filename, filepath, width, height, captured_at)
-        VALUES (?, ?, ?, ?, ?)
-    """
-    
     photo_id = db.execute_insert(
-        query,
-        (filename, filepath, width, height, captured_at.isoformat())
+        _CREATE_PHOTO_SQL,
+        (filename, filepath, width, height, captured_at)
     )
+    invalidate_stats_cache()
     
     logger.debug(f"📝 Created photo record: {filename} (ID: {photo_id})")
     return photo_id
@@ -71,56 +146,97 @@ def get_photo(photo_id: int) -> Optional[Photo]:
     return None
 
 
-def get_photos(
-    limit: int = 100,
+def iter_photos(
+    limit: Optional[int] = None,
     offset: int = 0,
     has_detections: Optional[bool] = None,
     start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None
-) -> List[Photo]:
+    end_date: Optional[datetime] = None,
+    before_id: Optional[int] = None
+) -> Iterator[Photo]:
     """
-    Get photos with optional filtering
+    Stream photos with optional filtering
+    
+    Rows are read from the cursor as they are consumed, so memory stays
+    constant regardless of how many photos match.
     
     Args:
-        limit: Maximum number of photos to return
+        limit: Maximum number of photos to yield (None for all)
         offset: Number of photos to skip (pagination)
         has_detections: Filter by detection presence
         start_date: Filter photos after this date
         end_date: Filter photos before this date
+        before_id: Keyset cursor; only return photos that sort after this ID
+            (the last ID of the previous page). Prefer over offset for deep pages.
+            Raises ValueError if that photo no longer exists
     
-    Returns:
-        List of Photo objects
+    Yields:
+        Photo objects
     """
     db = get_db()
     
-    conditions = []
+    mask = 0
     params = []
     
     if has_detections is not None:
-        conditions.append("has_detections = ?")
+        mask |= 1
         params.append(1 if has_detections else 0)
     
     if start_date:
-        conditions.append("captured_at >= ?")
-        params.append(start_date.isoformat())
+        mask |= 2
+        params.append(start_date)
     
     if end_date:
-        conditions.append("captured_at <= ?")
-        params.append(end_date.isoformat())
+        mask |= 4
+        params.append(end_date)
     
-    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    if before_id is not None:
+        cursor_rows = db.execute_query(_CURSOR_SORT_KEY_SQL, (before_id,))
+        if not cursor_rows:
+            raise ValueError(f"Pagination cursor photo {before_id} no longer exists")
+        mask |= 8
+        params.extend([cursor_rows[0]['captured_at'], before_id])
     
-    query = f"""
-        SELECT * FROM photos
-        {where_clause}
-        ORDER BY captured_at DESC
-        LIMIT ? OFFSET ?
+    query = _LIST_PHOTOS_SQL[mask]
+    
+    # SQLite treats a negative LIMIT as "no limit"
+    params.extend([limit if limit is not None else -1, offset])
+    
+    for row in db.iter_query(query, tuple(params)):
+        yield Photo(*row)
+
+
+def get_photos(
+    limit: int = 100,
+    offset: int = 0,
+    has_detections: Optional[bool] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    before_id: Optional[int] = None
+) -> List[Photo]:
     """
+    Get photos with optional filtering
     
-    params.extend([limit, offset])
-    rows = db.execute_query(query, tuple(params))
+    Args:
+        limit: Maximum number of photos to return
+        offset: Number of photos to skip (pagination)
+        has_detections: Filter by detection presence
+        start_date: Filter photos after this date
+        end_date: Filter photos before this date
+        before_id: Keyset cursor; only return photos that sort after this ID
+            (the last ID of the previous page). Prefer over offset for deep pages
     
-    return [Photo.from_row(row) for row in rows]
+    Returns:
+        List of Photo objects
+    """
+    return list(iter_photos(
+        limit=limit,
+        offset=offset,
+        has_detections=has_detections,
+        start_date=start_date,
+        end_date=end_date,
+        before_id=before_id
+    ))
 
 
 def update_photo_detections(photo_id: int, detection_count: int):
@@ -132,9 +248,52 @@ def update_photo_detections(photo_id: int, detection_count: int):
         detection_count: Number of detections
     """
     db = get_db()
-    query = """
-        UPDATE photos 
-        SET has_detections = ?, detection_count = ?
-        WHERE id = ?
+    db.execute_update(_UPDATE_PHOTO_DETECTIONS_SQL, (1 if detection_count > 0 else 0, detection_count, photo_id))
+    invalidate_stats_cache()
+
+
+def get_photos_with_detections(
+    limit: int = 100,
+    offset: int = 0,
+    has_detections: Optional[bool] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    before_id: Optional[int] = None
+) -> List[dict]:
     """
-    db.execute_update(query, (1 if detection_count > 0 else 0, detection_count, photo_id))
+    Get a page of photos with their detections attached
+    
+    Issues two queries (the photo page, then every detection for those
+    photos) instead of one detection query per photo.
+    
+    Args:
+        limit: Maximum number of photos to return
+        offset: Number of photos to skip (pagination)
+        has_detections: Filter by detection presence
+        start_date: Filter photos after this date
+        end_date: Filter photos before this date
+        before_id: Keyset cursor; only return photos that sort after this ID
+            (the last ID of the previous page). Prefer over offset for deep pages
+    
+    Returns:
+        List of photo dictionaries, each with a 'detections' list
+    """
+    from .detections import get_detections_for_photos
+    
+    photos = get_photos(
+        limit=limit,
+        offset=offset,
+        has_detections=has_detections,
+        start_date=start_date,
+        end_date=end_date,
+        before_id=before_id
+    )
+    detections_by_photo = get_detections_for_photos(photo.id for photo in photos)
+    
+    result = []
+    for photo in photos:
+        photo_dict = photo.to_dict()
+        photo_dict['detections'] = [det.to_dict() for det in detections_by_photo[photo.id]]
+        result.append(photo_dict)
+    
+    return result
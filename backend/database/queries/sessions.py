@@ -28,12 +28,17 @@ def create_session(
     """
     db = get_db()
     
+    # Store started_at in the same local ISO format as photos.captured_at
+    # so session windows can be compared against photo timestamps in SQL
     query = """
-        INSERT INTO detection_sessions (model_name, confidence_threshold)
-        VALUES (?, ?)
+        INSERT INTO detection_sessions (started_at, model_name, confidence_threshold)
+        VALUES (?, ?, ?)
     """
     
-    session_id = db.execute_insert(query, (model_name, confidence_threshold))
+    session_id = db.execute_insert(
+        query,
+        (datetime.now(), model_name, confidence_threshold)
+    )
     logger.info(f"🎬 Started detection session {session_id}")
     return session_id
 
@@ -55,10 +60,43 @@ def end_session(session_id: int, photo_count: int, detection_count: int):
         WHERE id = ?
     """
     
-    db.execute_update(query, (datetime.now().isoformat(), photo_count, detection_count, session_id))
+    db.execute_update(query, (datetime.now(), photo_count, detection_count, session_id))
     logger.info(f"🎬 Ended detection session {session_id}: {photo_count} photos, {detection_count} detections")
 
 
+def end_session_autocount(session_id: int):
+    """
+    End a detection session, computing final counts in SQL
+    
+    Counts photos captured during the session window and their detections
+    in the same UPDATE, instead of aggregating them in Python first.
+    
+    Args:
+        session_id: Session ID
+    """
+    db = get_db()
+    
+    query = """
+        UPDATE detection_sessions
+        SET ended_at = :ended_at,
+            photo_count = (
+                SELECT COUNT(*) FROM photos p
+                WHERE p.captured_at >= detection_sessions.started_at
+                  AND p.captured_at <= :ended_at
+            ),
+            detection_count = (
+                SELECT COUNT(*) FROM detections d
+                JOIN photos p ON d.photo_id = p.id
+                WHERE p.captured_at >= detection_sessions.started_at
+                  AND p.captured_at <= :ended_at
+            )
+        WHERE id = :session_id
+    """
+    
+    db.execute_update(query, {"ended_at": datetime.now(), "session_id": session_id})
+    logger.info(f"🎬 Ended detection session {session_id} (counts computed from database)")
+
+
 def get_sessions(limit: int = 10) -> List[DetectionSession]:
     """
     Get recent detection sessions
@@ -2,13 +2,37 @@
 Statistics and aggregation queries
 """
 
+import time
+from typing import Optional, Tuple
+
 from ..db import get_db
 
+# Seconds a computed stats snapshot is served before re-aggregating
+STATS_CACHE_TTL = 5.0
+
+# (computed_at, stats) from time.monotonic(); None when invalidated
+_cache: Optional[Tuple[float, dict]] = None
+
+# Bumped on every invalidation so a slow aggregation that raced with a
+# write doesn't repopulate the cache with stale numbers
+_generation = 0
+
+
+def invalidate_stats_cache():
+    """Discard cached statistics (call after writing photos or detections)"""
+    global _cache, _generation
+    _generation += 1
+    _cache = None
+
 
 def get_detection_stats() -> dict:
     """
     Get overall detection statistics
     
+    Results are cached for STATS_CACHE_TTL seconds and dropped as soon as
+    a photo or detection is written, so dashboard polling doesn't re-run
+    the full-table aggregation every few seconds.
+    
     Returns:
         Dictionary with stats including:
         - total_photos: Total number of photos
@@ -18,4 +42,16 @@ def get_detection_stats() -> dict:
         - avg_confidence: Average detection confidence
         - top_classes: Most detected classes
     """
-    return get_db().get_stats()
+    global _cache
+    
+    cached = _cache
+    if cached is not None and time.monotonic() - cached[0] < STATS_CACHE_TTL:
+        return cached[1]
+    
+    generation = _generation
+    stats = get_db().get_stats()
+    
+    if generation == _generation:
+        _cache = (time.monotonic(), stats)
+    
+    return stats
@@ -0,0 +1,117 @@
+"""
+Query plan checks for hot list queries
+
+Runs EXPLAIN QUERY PLAN over every pre-built list query variant and flags
+any that fall back to a full table scan. Index choices are easy to lose
+silently (a new filter, a dropped index, an aliased ORDER BY column), so
+run this after touching schema.sql, migrations, or the query modules.
+
+Usage:
+    python -m backend.database.query_plans
+    python -m backend.database.query_plans --db data/detections.db
+"""
+
+import argparse
+import logging
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .db import Database, get_db
+
+logger = logging.getLogger(__name__)
+
+# "SCAN photos" walks the whole table; "SCAN photos USING INDEX ..." walks an
+# index in ORDER BY order and stops at LIMIT, which is fine
+_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+def _hot_queries() -> Dict[str, str]:
+    """Collect the SQL for every hot-path query, keyed by a readable name"""
+    from .queries.photos import PHOTO_SELECT, _LIST_PHOTOS_SQL, _PHOTO_FILTERS
+    from .queries.detections import _LIST_DETECTIONS_SQL, _DETECTION_FILTERS
+    
+    def describe(prefix: str, mask: int, filters: Tuple[str, ...]) -> str:
+        enabled = [condition for bit, condition in enumerate(filters) if mask & (1 << bit)]
+        return f"{prefix} [{' AND '.join(enabled) or 'no filters'}]"
+    
+    queries = {}
+    for mask, sql in _LIST_PHOTOS_SQL.items():
+        queries[describe("iter_photos", mask, _PHOTO_FILTERS)] = sql
+    for mask, sql in _LIST_DETECTIONS_SQL.items():
+        queries[describe("iter_detections", mask, _DETECTION_FILTERS)] = sql
+    
+    queries["get_detections_for_photos"] = (
+        "SELECT id FROM detections WHERE photo_id IN (?, ?) ORDER BY photo_id, confidence DESC"
+    )
+    queries["get_marked_photos"] = (
+        f"SELECT {PHOTO_SELECT} FROM photos WHERE marked_for_retraining = 1 ORDER BY photos.marked_at DESC"
+    )
+    return queries
+
+
+def explain(db: Database, sql: str) -> List[str]:
+    """
+    Get the EXPLAIN QUERY PLAN detail lines for a query
+    
+    Args:
+        db: Database instance
+        sql: Query with ? placeholders (bound to NULL for planning)
+    
+    Returns:
+        Plan detail strings, outermost first
+    """
+    params = (None,) * sql.count("?")
+    return [row['detail'] for row in db.execute_query(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def check_query_plans(db: Optional[Database] = None) -> List[str]:
+    """
+    Check that no hot-path query plans a full table scan
+    
+    Args:
+        db: Database instance (default: shared instance)
+    
+    Returns:
+        List of problems found (empty if every plan uses an index)
+    """
+    db = db or get_db()
+    problems = []
+    
+    for name, sql in _hot_queries().items():
+        plan = explain(db, sql)
+        for detail in plan:
+            match = _FULL_SCAN.match(detail)
+            if match:
+                problems.append(f"{name}: full scan of {match.group(1)} ({'; '.join(plan)})")
+            elif detail == "USE TEMP B-TREE FOR ORDER BY":
+                # Sorting every match is worth knowing about but not fatal
+                logger.info(f"ℹ️  {name}: sorts all matching rows")
+    
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check hot database queries for full table scans')
+    parser.add_argument('--db', type=str, default=None, help='Database path (default: data/detections.db)')
+    
+    args = parser.parse_args()
+    db = Database(Path(args.db)) if args.db else get_db()
+    
+    problems = check_query_plans(db)
+    for problem in problems:
+        logger.error(f"❌ {problem}")
+    
+    if problems:
+        sys.exit(1)
+    
+    logger.info(f"✅ All {len(_hot_queries())} hot query plans use an index")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    main()
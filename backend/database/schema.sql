@@ -41,9 +41,45 @@ CREATE TABLE IF NOT EXISTS detection_sessions (
 );
 
 -- Indexes for common queries
-CREATE INDEX IF NOT EXISTS idx_photos_captured_at ON photos(captured_at);
+-- List queries order by time and filter on the trailing columns, so the
+-- filters are checked from the index without touching table rows
+CREATE INDEX IF NOT EXISTS idx_photos_captured_has_det ON photos(captured_at DESC, has_detections);
 CREATE INDEX IF NOT EXISTS idx_photos_has_detections ON photos(has_detections);
 CREATE INDEX IF NOT EXISTS idx_detections_photo_id ON detections(photo_id);
-CREATE INDEX IF NOT EXISTS idx_detections_class_name ON detections(class_name);
-CREATE INDEX IF NOT EXISTS idx_detections_created_at ON detections(created_at);
+CREATE INDEX IF NOT EXISTS idx_detections_created_class_conf ON detections(created_at DESC, class_name, confidence);
+-- Seeks straight to one class in time order (rare classes like deer)
+CREATE INDEX IF NOT EXISTS idx_detections_class_created ON detections(class_name, created_at);
 CREATE INDEX IF NOT EXISTS idx_sessions_started_at ON detection_sessions(started_at);
+
+-- Per-class detection counts, kept current by the triggers below so the
+-- stats endpoint never has to GROUP BY over the whole detections table
+-- (existing rows are backfilled by migration 004)
+CREATE TABLE IF NOT EXISTS stats_rollup (
+    class_name TEXT PRIMARY KEY,
+    detection_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_rollup_insert
+AFTER INSERT ON detections
+BEGIN
+    INSERT INTO stats_rollup (class_name, detection_count) VALUES (NEW.class_name, 1)
+    ON CONFLICT(class_name) DO UPDATE SET detection_count = detection_count + 1;
+END;
+
+-- Also fires for detections removed by ON DELETE CASCADE from photos
+CREATE TRIGGER IF NOT EXISTS trg_stats_rollup_delete
+AFTER DELETE ON detections
+BEGIN
+    UPDATE stats_rollup SET detection_count = detection_count - 1 WHERE class_name = OLD.class_name;
+    DELETE FROM stats_rollup WHERE class_name = OLD.class_name AND detection_count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_rollup_update
+AFTER UPDATE OF class_name ON detections
+WHEN OLD.class_name IS NOT NEW.class_name
+BEGIN
+    UPDATE stats_rollup SET detection_count = detection_count - 1 WHERE class_name = OLD.class_name;
+    DELETE FROM stats_rollup WHERE class_name = OLD.class_name AND detection_count <= 0;
+    INSERT INTO stats_rollup (class_name, detection_count) VALUES (NEW.class_name, 1)
+    ON CONFLICT(class_name) DO UPDATE SET detection_count = detection_count + 1;
+END;
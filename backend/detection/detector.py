@@ -11,17 +11,21 @@
 
 import cv2
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from ultralytics import YOLO
 import logging
 
+from backend.detection.model_export import resolve_model_path
+from backend.detection.runtime import YARD_ANIMALS, configure_inference_threads, yard_class_ids
+
 logger = logging.getLogger(__name__)
 
-# COCO dataset classes that are relevant for yard tracking
-YARD_ANIMALS = [
-    'person', 'bird', 'cat', 'dog', 'horse', 'sheep', 'cow',
-    'elephant', 'bear', 'zebra', 'giraffe'
-]
+# Background threads that draw and write visualization JPEGs
+VISUALIZATION_WORKERS = 2
+
+# Inference size predict() uses for photos (the size the models are trained at)
+DETECTOR_IMGSZ = 640
 
 class YOLODetector:
     """Handles object detection using YOLO model"""
@@ -47,6 +51,13 @@ class YOLODetector:
         
         self.model = None
         
+        # JPEG encoding and disk writes for visualizations run here, so
+        # detect() returns (and the next inference starts) without waiting
+        self._viz_pool = ThreadPoolExecutor(
+            max_workers=VISUALIZATION_WORKERS,
+            thread_name_prefix="visualization"
+        )
+        
         logger.info(f"🤖 Initializing YOLO detector...")
         logger.info(f"📊 Confidence threshold: {confidence_threshold}")
         
@@ -60,16 +71,23 @@ class YOLODetector:
             self.model_path.parent.mkdir(parents=True, exist_ok=True)
             
             logger.info(f"📦 Loading model: {self.model_path.name}")
+            configure_inference_threads()
             
-            # This will download the model if it doesn't exist (~6MB for yolov8n)
-            self.model = YOLO(str(self.model_path))
+            # Prefer an exported NCNN/OpenVINO bundle next to the weights
+            # (predict() runs at the default 640, so only a 640 export fits);
+            # otherwise this will download the model if it doesn't exist (~6MB for yolov8n)
+            self.model = YOLO(str(resolve_model_path(self.model_path, imgsz=DETECTOR_IMGSZ)))
             
             # Get class names from model
             self.class_names = self.model.names
             
+            # Restrict COCO models to yard classes; custom models keep all
+            self.class_ids = yard_class_ids(self.class_names)
+            
             logger.info(f"✅ Model loaded successfully")
             logger.info(f"📋 Model can detect {len(self.class_names)} object classes")
-            logger.info(f"🐾 Yard-relevant classes: {', '.join(YARD_ANIMALS)}")
+            if self.class_ids is not None:
+                logger.info(f"🐾 Yard-relevant classes: {', '.join(YARD_ANIMALS)}")
             
         except Exception as e:
             logger.error(f"❌ Failed to load model: {e}")
@@ -93,61 +111,31 @@ class YOLODetector:
         """
         image_path = Path(image_path)
         
-        if not image_path.exists():
-            logger.error(f"❌ Image not found: {image_path}")
+        # Decode once; the same array feeds inference and the visualization
+        image = cv2.imread(str(image_path))
+        if image is None:
+            logger.error(f"❌ Image not found or unreadable: {image_path}")
             return []
         
         try:
             # Run detection
             start_time = time.time()
             results = self.model.predict(
-                source=str(image_path),
+                source=image,
                 conf=self.confidence_threshold,
+                classes=self.class_ids,
                 verbose=False  # Suppress detailed logging
             )
             inference_time = (time.time() - start_time) * 1000  # Convert to ms
             
             # Parse results
-            detections = []
-            result = results[0]  # First (and only) image
-            
-            # Get image dimensions for normalization
-            img_height, img_width = result.orig_shape
-            
-            for box in result.boxes:
-                class_id = int(box.cls[0])
-                class_name = self.class_names[class_id]
-                confidence = float(box.conf[0])
-                bbox = box.xyxy[0].tolist()  # [x1, y1, x2, y2]
-                
-                # Calculate normalized bbox for database
-                x1, y1, x2, y2 = bbox
-                bbox_norm = {
-                    'x': (x1 + x2) / 2 / img_width,      # center x (normalized)
-                    'y': (y1 + y2) / 2 / img_height,     # center y (normalized)
-                    'width': (x2 - x1) / img_width,       # width (normalized)
-                    'height': (y2 - y1) / img_height      # height (normalized)
-                }
-                
-                detection = {
-                    'class': class_name,
-                    'confidence': confidence,
-                    'bbox': bbox,
-                    'bbox_norm': bbox_norm
-                }
-                detections.append(detection)
-            
-            # Log results
-            if detections:
-                logger.info(f"🔍 Detected {len(detections)} object(s) in {image_path.name} ({inference_time:.0f}ms)")
-                for det in detections:
-                    logger.info(f"   🐾 {det['class']}: {det['confidence']:.2%} confidence")
-            else:
-                logger.debug(f"🔍 No objects detected in {image_path.name} ({inference_time:.0f}ms)")
+            detections = self._parse_result(results[0])  # First (and only) image
+            self._log_detections(image_path, detections, inference_time)
             
-            # Optionally save visualization
+            # Optionally save visualization (in the background; the decoded
+            # image isn't used again here, so no copy is needed)
             if save_visualization and detections:
-                self._save_visualization(image_path, detections)
+                self._viz_pool.submit(self._save_visualization, image, image_path, detections)
             
             return detections
             
@@ -155,12 +143,41 @@ class YOLODetector:
             logger.error(f"❌ Detection failed for {image_path.name}: {e}")
             return []
     
-    def _save_visualization(self, image_path, detections):
-        """Draw bounding boxes on image and save"""
+    def _parse_result(self, result):
+        """Convert a single ultralytics result into detection dicts"""
+        detections = []
+        boxes = result.boxes
+        
+        # Pull whole tensors once; xywhn is already normalized to the
+        # original image size (center x, center y, width, height)
+        xyxy = boxes.xyxy.cpu().numpy().tolist()
+        xywhn = boxes.xywhn.cpu().numpy().tolist()
+        confidences = boxes.conf.cpu().numpy().tolist()
+        class_ids = boxes.cls.cpu().numpy().astype(int).tolist()
+        
+        for bbox, (x, y, w, h), confidence, class_id in zip(xyxy, xywhn, confidences, class_ids):
+            detection = {
+                'class': self.class_names[class_id],
+                'confidence': confidence,
+                'bbox': bbox,  # [x1, y1, x2, y2]
+                'bbox_norm': {'x': x, 'y': y, 'width': w, 'height': h}
+            }
+            detections.append(detection)
+        
+        return detections
+    
+    def _log_detections(self, image_path, detections, inference_time):
+        """Log detection results for an image"""
+        if detections:
+            logger.info(f"🔍 Detected {len(detections)} object(s) in {image_path.name} ({inference_time:.0f}ms)")
+            for det in detections:
+                logger.info(f"   🐾 {det['class']}: {det['confidence']:.2%} confidence")
+        else:
+            logger.debug(f"🔍 No objects detected in {image_path.name} ({inference_time:.0f}ms)")
+    
+    def _save_visualization(self, image, image_path, detections):
+        """Draw bounding boxes on an already-decoded BGR image and save"""
         try:
-            # Read image
-            image = cv2.imread(str(image_path))
-            
             # Draw each detection
             for det in detections:
                 x1, y1, x2, y2 = [int(coord) for coord in det['bbox']]
@@ -192,7 +209,11 @@ class YOLODetector:
             output_dir.mkdir(exist_ok=True)
             output_path = output_dir / f"detected_{image_path.name}"
             
-            cv2.imwrite(str(output_path), image)
+            # Encode in memory and write the bytes in one call
+            success, encoded = cv2.imencode('.jpg', image)
+            if not success:
+                raise ValueError(f"JPEG encoding failed for {image_path.name}")
+            encoded.tofile(str(output_path))
             logger.debug(f"💾 Saved visualization: {output_path}")
             
         except Exception as e:
@@ -213,7 +234,53 @@ class YOLODetector:
         total_detections = 0
         start_time = time.time()
         
-        for image_path in image_paths:
+        # Ultralytics sorts list sources and drops images it can't read, so
+        # results are matched to inputs by result.path, never by position
+        remaining = {}
+        for image_path in map(Path, image_paths):
+            if image_path.exists():
+                remaining.setdefault(str(image_path.absolute()), []).append(image_path)
+            else:
+                logger.error(f"❌ Image not found: {image_path}")
+                results[str(image_path)] = []
+        
+        # One streaming predict call for the whole batch, so model setup
+        # happens once and preprocessing overlaps with inference
+        try:
+            predictions = self.model.predict(
+                source=list(remaining),
+                conf=self.confidence_threshold,
+                classes=self.class_ids,
+                stream=True,
+                verbose=False
+            ) if remaining else []
+            
+            for result in predictions:
+                same_file = remaining.pop(result.path, [])
+                for image_path in same_file:
+                    try:
+                        detections = self._parse_result(result)
+                        self._log_detections(image_path, detections, result.speed['inference'])
+                        
+                        if save_visualization and detections:
+                            # Reuse the frame ultralytics already decoded
+                            # (copied if the same file was passed twice, since
+                            # drawing mutates it)
+                            image = result.orig_img if len(same_file) == 1 else result.orig_img.copy()
+                            self._viz_pool.submit(self._save_visualization, image, image_path, detections)
+                    except Exception as e:
+                        logger.error(f"❌ Detection failed for {image_path.name}: {e}")
+                        detections = []
+                    
+                    results[str(image_path)] = detections
+                    total_detections += len(detections)
+        except Exception as e:
+            logger.error(f"❌ Batch detection failed: {e}")
+        
+        # Images the stream never returned (unreadable, or left over after a
+        # failure) go through detect() one at a time, which logs and returns
+        # [] for the ones that really can't be read
+        for image_path in (path for paths in remaining.values() for path in paths):
             detections = self.detect(image_path, save_visualization)
             results[str(image_path)] = detections
             total_detections += len(detections)
@@ -222,6 +289,10 @@ class YOLODetector:
         logger.info(f"📊 Batch complete: {len(image_paths)} images, {total_detections} total detections in {elapsed_time:.1f}s")
         
         return results
+    
+    def close(self):
+        """Wait for pending visualization writes and stop the writer threads"""
+        self._viz_pool.shutdown(wait=True)
 
 def test_detector():
     """Test the detector on captured photos"""
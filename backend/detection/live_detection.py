@@ -4,13 +4,15 @@ Live object detection for streaming video
 Handles real-time YOLO detection on video frames with normalized bounding boxes.
 """
 
-import time
 import logging
 from datetime import datetime
 from typing import List, Dict, Optional
 
 import numpy as np
 
+from backend.detection.model_export import LIVE_DETECTION_IMGSZ, resolve_model_path
+from backend.detection.runtime import configure_inference_threads, yard_class_ids
+
 logger = logging.getLogger(__name__)
 
 # Try to import YOLO
@@ -29,22 +31,31 @@ class LiveDetector:
     Lightweight wrapper around YOLO for low-latency detection
     """
     
-    def __init__(self, model_path: str, confidence_threshold: float = 0.25):
+    def __init__(self, model_path: str, confidence_threshold: float = 0.25, imgsz: int = LIVE_DETECTION_IMGSZ):
         """
         Initialize live detector
         
         Args:
             model_path: Path to YOLO model file
             confidence_threshold: Minimum detection confidence
+            imgsz: Inference size; the 640x480 stream is downscaled to this
         """
         self.model_path = model_path
         self.confidence_threshold = confidence_threshold
+        self.imgsz = imgsz
         self.detector = None
+        self.class_ids = None
         
         if YOLO_AVAILABLE:
             try:
-                logger.info(f"🤖 Loading YOLO model for live detection: {model_path}")
-                self.detector = YOLO(model_path)
+                # Prefer an exported FP16 NCNN bundle next to the weights,
+                # if it was built for the size we predict at
+                resolved_path = resolve_model_path(model_path, imgsz=self.imgsz)
+                logger.info(f"🤖 Loading YOLO model for live detection: {resolved_path}")
+                configure_inference_threads()
+                self.detector = YOLO(str(resolved_path))
+                # Restrict COCO models to yard classes; custom models keep all
+                self.class_ids = yard_class_ids(self.detector.names)
                 logger.info("✅ Live detector ready")
             except Exception as e:
                 logger.error(f"❌ Failed to load live detector: {e}")
@@ -67,6 +78,8 @@ class LiveDetector:
             results = self.detector.predict(
                 source=frame,
                 conf=self.confidence_threshold,
+                classes=self.class_ids,
+                imgsz=self.imgsz,
                 verbose=False,
                 device='cpu'  # Force CPU for real-time processing
             )
@@ -74,38 +87,41 @@ class LiveDetector:
             # Parse results
             detections = []
             result = results[0]
+            boxes = result.boxes
             
-            height, width = frame.shape[:2]
+            # Pull whole tensors once; ultralytics already provides the
+            # boxes normalized to the frame size (0-1 range)
+            xyxyn = boxes.xyxyn.cpu().numpy().tolist()
+            xywhn = boxes.xywhn.cpu().numpy().tolist()
+            confidences = boxes.conf.cpu().numpy().tolist()
+            class_ids = boxes.cls.cpu().numpy().astype(int).tolist()
             
-            for box in result.boxes:
-                class_id = int(box.cls[0])
-                class_name = self.detector.names[class_id]
-                confidence = float(box.conf[0])
-                
-                # Get bounding box coordinates (pixels)
-                x1, y1, x2, y2 = box.xyxy[0].tolist()
-                
-                # Calculate normalized coordinates (0-1 range)
-                x_center = (x1 + x2) / 2 / width
-                y_center = (y1 + y2) / 2 / height
-                bbox_width = (x2 - x1) / width
-                bbox_height = (y2 - y1) / height
+            # Every box in a frame shares one timestamp, so format it once
+            now = datetime.now()
+            timestamp = now.isoformat()
+            id_prefix = f"live_{int(now.timestamp() * 1000)}"
+            
+            for index, (box_xyxyn, box_xywhn, confidence, class_id) in enumerate(
+                zip(xyxyn, xywhn, confidences, class_ids)
+            ):
+                x_min, y_min, x_max, y_max = box_xyxyn
+                x_center, y_center, bbox_width, bbox_height = box_xywhn
                 
                 detections.append({
-                    "id": f"live_{int(time.time() * 1000)}_{len(detections)}",
-                    "class_name": class_name,
+                    "id": f"{id_prefix}_{index}",
+                    "class_name": self.detector.names[class_id],
                     "confidence": confidence,
                     "bbox": {
-                        "x_min": x1 / width,
-                        "y_min": y1 / height,
-                        "x_max": x2 / width,
-                        "y_max": y2 / height,
+                        "x_min": x_min,
+                        "y_min": y_min,
+                        "x_max": x_max,
+                        "y_max": y_max,
                         "x_center": x_center,
                         "y_center": y_center,
                         "width": bbox_width,
                         "height": bbox_height
                     },
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": timestamp
                 })
             
             return detections
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Pi-optimized model exports
+
+PyTorch FP32 weights are slow on the Pi's ARM CPU. Ultralytics can export
+a model to NCNN with FP16 weights, which runs several times faster and uses
+half the memory. The detectors automatically prefer an exported bundle
+sitting next to the .pt file when one exists, is newer than the weights,
+and was exported at the size the detector runs at.
+
+Usage:
+    python backend/detection/model_export.py --model models/custom_model/weights/best.pt
+"""
+
+import argparse
+import logging
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Directory suffixes Ultralytics uses for exported bundles, in order of preference
+EXPORT_SUFFIXES = ("_ncnn_model", "_openvino_model")
+
+# Inference size LiveDetector runs at, and so the default export size
+LIVE_DETECTION_IMGSZ = 320
+
+
+def _export_imgsz(exported: Path) -> Optional[int]:
+    """Image size an exported bundle was built for (from its metadata.yaml), if known"""
+    try:
+        import yaml
+        with open(exported / "metadata.yaml") as f:
+            imgsz = yaml.safe_load(f).get("imgsz")
+    except Exception:
+        return None
+    
+    if isinstance(imgsz, (list, tuple)):
+        return max(imgsz) if imgsz else None
+    return imgsz
+
+
+def resolve_model_path(model_path: Union[str, Path], imgsz: Optional[int] = None) -> Path:
+    """
+    Return a usable exported bundle for a .pt model if one exists, else the model itself
+    
+    An export is skipped (with a warning) if it is older than the .pt file,
+    e.g. left over from before a retrain, or if it was built for a
+    different inference size than imgsz.
+    
+    Args:
+        model_path: Path to YOLO .pt weights (or an already-exported model)
+        imgsz: Inference size the caller will predict at (None: any size)
+    
+    Returns:
+        Path to load with YOLO()
+    """
+    model_path = Path(model_path)
+    
+    if model_path.suffix != '.pt':
+        return model_path
+    
+    try:
+        weights_mtime = model_path.stat().st_mtime
+    except OSError:
+        weights_mtime = None  # Not downloaded yet; any export is all we have
+    
+    for suffix in EXPORT_SUFFIXES:
+        exported = model_path.with_name(f"{model_path.stem}{suffix}")
+        if not exported.is_dir():
+            continue
+        
+        if weights_mtime is not None and exported.stat().st_mtime < weights_mtime:
+            logger.warning(f"⚠️  Ignoring {exported}: older than {model_path.name} (re-export it)")
+            continue
+        
+        export_imgsz = _export_imgsz(exported)
+        if imgsz is not None and export_imgsz != imgsz:
+            logger.warning(f"⚠️  Ignoring {exported}: exported for imgsz={export_imgsz}, need {imgsz}")
+            continue
+        
+        logger.info(f"⚡ Using exported model: {exported}")
+        return exported
+    
+    return model_path
+
+
+def export_for_pi(model_path: Union[str, Path], imgsz: int = LIVE_DETECTION_IMGSZ) -> Path:
+    """
+    Export a .pt model to an FP16 NCNN bundle next to the weights
+    
+    Args:
+        model_path: Path to YOLO .pt weights
+        imgsz: Inference image size baked into the export (the size the
+            detector that should use it predicts at)
+    
+    Returns:
+        Path to the exported model directory
+    """
+    from ultralytics import YOLO
+    
+    model_path = Path(model_path)
+    logger.info(f"📦 Exporting {model_path} to NCNN (FP16, imgsz={imgsz})")
+    
+    exported = YOLO(str(model_path)).export(format='ncnn', half=True, imgsz=imgsz)
+    
+    logger.info(f"✅ Exported model: {exported}")
+    return Path(exported)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export a YOLO model for fast inference on Raspberry Pi')
+    parser.add_argument('--model', type=str, default='models/custom_model/weights/best.pt', help='YOLO .pt weights')
+    parser.add_argument('--imgsz', type=int, default=LIVE_DETECTION_IMGSZ,
+                        help=f'Inference image size; must match the detector using it (default: {LIVE_DETECTION_IMGSZ}, LiveDetector)')
+    
+    args = parser.parse_args()
+    export_for_pi(args.model, imgsz=args.imgsz)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    main()
@@ -0,0 +1,82 @@
+"""
+Inference runtime tuning
+
+PyTorch sizes its intra-op thread pool to every core by default. On the
+Pi that leaves nothing for the camera capture thread and the API, and
+the contention shows up as jittery per-frame latency. Both detectors
+call configure_inference_threads() before loading a model.
+
+Pre-trained COCO models also score 80 classes, most of which never show
+up in a yard. yard_class_ids() lets the detectors restrict predict() to
+the relevant ones, so the rest are dropped inside NMS.
+"""
+
+import logging
+import os
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# COCO dataset classes that are relevant for yard tracking
+YARD_ANIMALS = [
+    'person', 'bird', 'cat', 'dog', 'horse', 'sheep', 'cow',
+    'elephant', 'bear', 'zebra', 'giraffe'
+]
+
+# Number of classes in pre-trained COCO models (yolov8n.pt etc.)
+COCO_CLASS_COUNT = 80
+
+_configured = False
+
+
+def configure_inference_threads(num_threads: Optional[int] = None):
+    """
+    Pin PyTorch's thread pools (once per process)
+    
+    Args:
+        num_threads: Intra-op threads for inference (default: all cores but one)
+    """
+    global _configured
+    if _configured:
+        return
+    _configured = True
+    
+    try:
+        import torch
+    except ImportError:
+        return
+    
+    if num_threads is None:
+        num_threads = max(1, (os.cpu_count() or 1) - 1)
+    
+    torch.set_num_threads(num_threads)
+    
+    try:
+        # Inference runs one op at a time; extra inter-op threads just compete
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Can only be set before PyTorch starts any parallel work
+        pass
+    
+    logger.info(f"🧵 Inference threads: {num_threads}")
+
+
+def yard_class_ids(class_names: Dict[int, str]) -> Optional[List[int]]:
+    """
+    Class IDs to pass as predict(classes=...) for a model
+    
+    Args:
+        class_names: Model's class ID -> name mapping (model.names)
+    
+    Returns:
+        IDs of the YARD_ANIMALS classes, or None (detect every class) for
+        models without the COCO class set, such as custom-trained ones
+    """
+    name_to_id = {name: class_id for class_id, name in class_names.items()}
+    
+    # Only the stock COCO class set; a model trained with extra classes
+    # (e.g. deer) must keep them even if it also knows the COCO names
+    if len(name_to_id) != COCO_CLASS_COUNT or not all(name in name_to_id for name in YARD_ANIMALS):
+        return None
+    
+    return [name_to_id[name] for name in YARD_ANIMALS]
@@ -5,54 +5,164 @@ Manages camera access between the main capture system and live streaming.
 Ensures both systems can work simultaneously without conflicts.
 """
 
+import os
 import threading
 import time
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
 from typing import Optional, Callable
 from datetime import datetime
 
+import cv2
+import numpy as np
+
 # Try to import picamera2
 try:
-    from picamera2 import Picamera2
+    from picamera2 import Picamera2, MappedArray
     CAMERA_AVAILABLE = True
 except ImportError:
     CAMERA_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Photo capture cadence and live stream frame spacing, in seconds
+CAPTURE_INTERVAL = 1.0
+STREAM_INTERVAL = 0.067  # ~15 FPS
+
+# The same intervals in integer nanoseconds for the time.monotonic_ns() loops
+_CAPTURE_INTERVAL_NS = int(CAPTURE_INTERVAL * 1_000_000_000)
+_STREAM_INTERVAL_NS = int(STREAM_INTERVAL * 1_000_000_000)
+
+# Live stream resolution (width, height)
+LORES_SIZE = (640, 480)
+
+# CPU the camera capture thread is pinned to (None to leave it unpinned) and
+# its SCHED_FIFO priority (None to keep normal scheduling). Both are best
+# effort: pinning is skipped if the CPU doesn't exist, and real-time
+# priority needs root or CAP_SYS_NICE. Adding isolcpus=3 to
+# /boot/firmware/cmdline.txt keeps everything else off that core.
+CAPTURE_THREAD_CPU = 3
+CAPTURE_THREAD_PRIORITY = 10
+
+# Side of the random tile repeated to fill simulated frames
+_NOISE_TILE = 128
+
+def _noise_frame(height: int, width: int) -> np.ndarray:
+    """Simulated sensor noise: one small random tile repeated over the frame"""
+    tile = np.random.default_rng().integers(0, 256, (_NOISE_TILE, _NOISE_TILE, 3), dtype=np.uint8)
+    reps = (-(-height // _NOISE_TILE), -(-width // _NOISE_TILE), 1)
+    return np.ascontiguousarray(np.tile(tile, reps)[:height, :width])
+
+def _tune_capture_thread():
+    """Pin the calling thread to CAPTURE_THREAD_CPU and give it real-time priority"""
+    # On Linux, pid 0 means the calling thread, not the whole process
+    if CAPTURE_THREAD_CPU is not None and hasattr(os, "sched_setaffinity"):
+        try:
+            if CAPTURE_THREAD_CPU in os.sched_getaffinity(0):
+                os.sched_setaffinity(0, {CAPTURE_THREAD_CPU})
+                logger.info(f"📌 Capture thread pinned to CPU {CAPTURE_THREAD_CPU}")
+        except OSError as e:
+            logger.debug(f"⚠️  Could not pin capture thread: {e}")
+    
+    if CAPTURE_THREAD_PRIORITY is not None and hasattr(os, "SCHED_FIFO"):
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(CAPTURE_THREAD_PRIORITY))
+            logger.info(f"⏱️  Capture thread running SCHED_FIFO (priority {CAPTURE_THREAD_PRIORITY})")
+        except OSError as e:
+            logger.debug(f"⚠️  Capture thread keeps normal scheduling: {e}")
+
+class _FrameWorker:
+    """
+    Runs one callback on its own thread, always with the newest frame
+    
+    The capture thread only drops a frame into a one-slot mailbox, so a
+    slow callback (disk write, WebSocket send) skips stale frames instead
+    of stalling capture for everyone else. Skipped frames are counted in
+    dropped so a consumer that can't keep up shows in get_camera_info().
+    """
+    
+    def __init__(self, callback: Callable, frame_type: str):
+        self.callback = callback
+        self.frame_type = frame_type
+        self.dropped = 0
+        self._frames = deque(maxlen=1)  # Overwrites the oldest frame
+        self._ready = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=f"camera-{frame_type}", daemon=True)
+        self._thread.start()
+    
+    def submit(self, array):
+        """Hand the worker a new frame, replacing any it has not picked up"""
+        with self._ready:
+            if self._frames:
+                self.dropped += 1
+            self._frames.append(array)
+            self._ready.notify()
+    
+    def stop(self):
+        """Stop the worker once its current callback returns"""
+        with self._ready:
+            self._stopped = True
+            self._ready.notify()
+    
+    def _run(self):
+        while True:
+            with self._ready:
+                while not self._frames and not self._stopped:
+                    self._ready.wait()
+                if self._stopped:
+                    return
+                array = self._frames.popleft()
+            
+            try:
+                self.callback(array, self.frame_type)
+            except Exception as e:
+                logger.debug(f"⚠️  {self.frame_type.capitalize()} callback error: {e}")
+
 class SharedCameraManager:
     """
-    Singleton camera manager that coordinates access between:
+    Camera manager that coordinates access between:
     1. Main capture system (saves photos to disk)
     2. Live streaming system (WebSocket feed)
     
-    Uses a single camera instance with dual output streams.
+    Uses a single camera instance with dual output streams. Get the shared
+    instance with get_shared_camera() rather than constructing one.
     """
     
-    _instance = None
-    _lock = threading.Lock()
-    
-    def __new__(cls):
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-        return cls._instance
-    
     def __init__(self):
-        if hasattr(self, '_initialized'):
-            return
-        
-        self._initialized = True
         self.camera = None
         self.is_started = False
-        self.capture_callbacks = []
-        self.stream_callbacks = []
+        # Callback workers are immutable tuples replaced on (rare)
+        # registration, so the capture thread can iterate them without
+        # copying or locking
+        self._capture_workers = ()
+        self._stream_workers = ()
+        self._callbacks_lock = threading.Lock()
         self._capture_thread = None
-        self._should_stop = False
+        self._stop_event = threading.Event()
+        # Main frames are copied off the capture thread, one at a time
+        self._main_copier = None
+        self._main_job = None
+        # Set while any callback is registered; the capture thread idles on it
+        self._wake_event = threading.Event()
         
         logger.info("📷 Initializing shared camera manager")
         self._init_camera()
+        
+        # Pick the frame source once; the capture thread runs it directly
+        if self.camera is None:
+            self._init_simulation()
+            self._capture_loop = self._simulation_loop
+            self._info_base = {"available": False, "simulation": True}
+        else:
+            self._info_base = {"available": True}
+            self._main_copier = ThreadPoolExecutor(max_workers=1, thread_name_prefix="camera-main")
+            # Start the copier thread here so it doesn't inherit the capture
+            # thread's CPU pinning and real-time priority
+            self._main_copier.submit(lambda: None)
+            self._capture_loop = self._camera_loop
     
     def _init_camera(self):
         """Initialize the camera with dual output configuration"""
@@ -66,19 +176,45 @@ class SharedCameraManager:
             # Configure camera for both still capture and video streaming
             # Main output: High resolution for photo capture
             # Lores output: Lower resolution for live streaming
-            config = self.camera.create_still_configuration(
+            # A video configuration keeps the sensor in a fast streaming mode
+            # with the lighter video ISP tuning; photos are simply sampled
+            # from the continuous main stream
+            # Two buffers let the sensor fill one while the loop copies the
+            # other; queue=False makes capture_request() always wait for a
+            # fresh frame rather than return one completed earlier
+            # YUV420 lores is half the bytes of RGB888 to read out of the
+            # camera buffer; it is converted to BGR (the byte order picamera2's
+            # "RGB888" uses, as for main) straight from the buffer
+            config = self.camera.create_video_configuration(
                 main={"size": (1920, 1080), "format": "RGB888"},  # For photo capture
-                lores={"size": (640, 480), "format": "RGB888"},   # For live streaming
-                display="lores"
+                lores={"size": LORES_SIZE, "format": "YUV420"},   # For live streaming
+                display="lores",
+                buffer_count=2,
+                queue=False
             )
             
             self.camera.configure(config)
             logger.info("📷 Camera configured: 1920x1080 (capture) + 640x480 (stream)")
-            
+        
         except Exception as e:
             logger.error(f"❌ Failed to initialize camera: {e}")
             self.camera = None
     
+    def _init_simulation(self):
+        """Generate the simulated frame contents once; every tick reuses them"""
+        width, height = LORES_SIZE
+        self._sim_capture = _noise_frame(1080, 1920)
+        self._sim_capture.setflags(write=False)
+        
+        # The static label is rendered once into the stream template
+        self._sim_stream = _noise_frame(height, width)
+        cv2.putText(self._sim_stream, "LIVE SIMULATION", (50, 50), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        
+        # Last rendered stream frame and the clock text drawn on it
+        self._sim_stream_frame = None
+        self._sim_stream_clock = None
+    
     def start(self):
         """Start the camera and capture thread"""
         if self.is_started:
@@ -97,7 +233,9 @@ class SharedCameraManager:
         
         # Start capture thread
         self.is_started = True
-        self._should_stop = False
+        self._stop_event.clear()
+        with self._callbacks_lock:
+            self._update_wake_event()
         self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
         self._capture_thread.start()
         
@@ -109,13 +247,18 @@ class SharedCameraManager:
             return
         
         logger.info("🛑 Stopping shared camera system")
-        self._should_stop = True
+        self._stop_event.set()
+        self._wake_event.set()  # Release a capture thread idling for callbacks
         self.is_started = False
         
         # Wait for capture thread
         if self._capture_thread:
             self._capture_thread.join(timeout=3)
         
+        # Let an in-flight main frame copy finish while its buffer is valid
+        if self._main_job is not None:
+            wait([self._main_job], timeout=3)
+        
         # Stop camera
         if self.camera:
             try:
@@ -126,127 +269,261 @@ class SharedCameraManager:
     
     def register_capture_callback(self, callback: Callable):
         """Register callback for photo capture events"""
-        self.capture_callbacks.append(callback)
-        logger.debug(f"📝 Registered capture callback (total: {len(self.capture_callbacks)})")
+        with self._callbacks_lock:
+            self._capture_workers = self._capture_workers + (_FrameWorker(callback, "capture"),)
+            self._update_wake_event()
+        logger.debug(f"📝 Registered capture callback (total: {len(self._capture_workers)})")
     
     def register_stream_callback(self, callback: Callable):
         """Register callback for live stream frames"""
-        self.stream_callbacks.append(callback)
-        logger.debug(f"📝 Registered stream callback (total: {len(self.stream_callbacks)})")
+        with self._callbacks_lock:
+            self._stream_workers = self._stream_workers + (_FrameWorker(callback, "stream"),)
+            self._update_wake_event()
+        logger.debug(f"📝 Registered stream callback (total: {len(self._stream_workers)})")
     
     def remove_capture_callback(self, callback: Callable):
         """Remove capture callback"""
-        if callback in self.capture_callbacks:
-            self.capture_callbacks.remove(callback)
+        with self._callbacks_lock:
+            removed = [w for w in self._capture_workers if w.callback == callback]
+            self._capture_workers = tuple(w for w in self._capture_workers if w.callback != callback)
+            self._update_wake_event()
+        for worker in removed:
+            worker.stop()
     
     def remove_stream_callback(self, callback: Callable):
         """Remove stream callback"""
-        if callback in self.stream_callbacks:
-            self.stream_callbacks.remove(callback)
+        with self._callbacks_lock:
+            removed = [w for w in self._stream_workers if w.callback == callback]
+            self._stream_workers = tuple(w for w in self._stream_workers if w.callback != callback)
+            self._update_wake_event()
+        for worker in removed:
+            worker.stop()
+    
+    def _update_wake_event(self):
+        """Wake the capture thread iff someone is listening (call with _callbacks_lock held)"""
+        if self._capture_workers or self._stream_workers:
+            self._wake_event.set()
+        else:
+            self._wake_event.clear()
+    
+    def capture_one(self, timeout: float = 5.0):
+        """
+        Grab a single high-resolution frame
+        
+        The camera system must already be started. The next capture frame
+        is taken, which can be up to CAPTURE_INTERVAL away.
+        
+        Args:
+            timeout: Seconds to wait for a frame
+        
+        Returns:
+            Read-only RGB numpy array, or None if no frame arrived in time
+        """
+        frames = []
+        received = threading.Event()
+        
+        def on_frame(array, frame_type):
+            frames.append(array)
+            received.set()
+        
+        self.register_capture_callback(on_frame)
+        try:
+            received.wait(timeout)
+        finally:
+            self.remove_capture_callback(on_frame)
+        
+        return frames[0] if frames else None
     
-    def _capture_loop(self):
-        """Main capture loop - handles both photo capture and live streaming"""
-        last_capture_time = 0
-        capture_interval = 1.0  # 1 second for photo capture
-        stream_interval = 0.067   # 15 FPS for live streaming
-        last_stream_time = 0
+    def _camera_loop(self):
+        """
+        Dispatch frames as the camera completes them
         
-        while not self._should_stop:
+        capture_request() blocks until libcamera delivers the next frame, so
+        the thread sleeps between frames instead of polling, and each
+        dispatch uses the frame that just arrived.
+        
+        The multi-MB main frame is copied on a separate thread (see
+        _copy_main_frame) so lores frames keep flowing during the copy.
+        make_array() copies with np.copy and cv2.cvtColor converts lores;
+        both release the GIL for the duration, so API threads keep running.
+        """
+        _tune_capture_thread()
+        
+        # Monotonic so NTP steps can't stall or burst the schedule; the
+        # first frame of each kind is due immediately
+        last_capture_time = -_CAPTURE_INTERVAL_NS
+        last_stream_time = -_STREAM_INTERVAL_NS
+        
+        while not self._stop_event.is_set():
+            # Nobody is listening: leave the frames with the camera until a
+            # callback registers (or stop() is called)
+            if not self._wake_event.is_set():
+                self._wake_event.wait()
+                continue
+            
+            try:
+                request = self.camera.capture_request()
+                stream_frame = None
+                try:
+                    current_time = time.monotonic_ns()
+                    
+                    # Handle photo capture (every CAPTURE_INTERVAL); if the
+                    # previous copy is still running, retry on the next frame
+                    # rather than tie up the other camera buffer too
+                    if current_time - last_capture_time >= _CAPTURE_INTERVAL_NS:
+                        if not self._capture_workers:
+                            last_capture_time = current_time
+                        elif self._main_job is None or self._main_job.done():
+                            # The extra reference keeps the buffer out of the
+                            # camera's hands until the copy is done
+                            request.acquire()
+                            self._main_job = self._main_copier.submit(self._copy_main_frame, request)
+                            last_capture_time = current_time
+                    
+                    # Handle live streaming (every STREAM_INTERVAL)
+                    if current_time - last_stream_time >= _STREAM_INTERVAL_NS:
+                        if self._stream_workers:
+                            # Convert straight out of the mapped buffer; the
+                            # BGR result is the only array allocated
+                            with MappedArray(request, "lores") as mapped:
+                                stream_frame = self._lores_to_bgr(mapped.array)
+                        last_stream_time = current_time
+                finally:
+                    # The lores frame is a copy now, so hand the buffer back
+                    # (the main copy holds its own reference)
+                    request.release()
+                
+                if stream_frame is not None:
+                    self._handle_live_stream(stream_frame)
+            
+            except Exception as e:
+                logger.error(f"❌ Error in capture loop: {e}")
+                self._stop_event.wait(0.5)
+    
+    def _copy_main_frame(self, request):
+        """Copy the main stream out of a request, release it and dispatch"""
+        try:
+            try:
+                array = request.make_array("main")
+            finally:
+                request.release()
+            self._handle_photo_capture(array)
+        except Exception as e:
+            logger.error(f"❌ Error copying capture frame: {e}")
+    
+    def _lores_to_bgr(self, yuv):
+        """
+        Convert a YUV420 lores frame to BGR
+        
+        picamera2's "RGB888" format is stored B, G, R in memory, so this
+        is the channel order the lores stream delivered before it moved to
+        YUV420 and the order the main stream still delivers. Stream
+        consumers (LiveDetector, the frame encoder) get the same frames
+        they always did; ultralytics treats numpy input as BGR.
+        
+        Args:
+            yuv: (height * 3/2, stride) view of the mapped lores buffer
+        
+        Returns:
+            BGR numpy array (height, width, 3)
+        """
+        width = LORES_SIZE[0]
+        bgr = cv2.cvtColor(yuv, cv2.COLOR_YUV2BGR_I420)
+        # Drop any row padding the camera added beyond the visible width
+        return bgr if bgr.shape[1] == width else bgr[:, :width]
+    
+    def _simulation_loop(self):
+        """Generate simulated frames on the capture and stream schedule"""
+        # Monotonic so NTP steps can't stall or burst the schedule; the
+        # first frame of each kind is due immediately
+        last_capture_time = -_CAPTURE_INTERVAL_NS
+        last_stream_time = -_STREAM_INTERVAL_NS
+        
+        while not self._stop_event.is_set():
+            # Nobody is listening: idle until a callback registers (or stop())
+            if not self._wake_event.is_set():
+                self._wake_event.wait()
+                continue
+            
             try:
-                current_time = time.time()
+                current_time = time.monotonic_ns()
                 
-                # Handle photo capture (every 1 second)
-                if current_time - last_capture_time >= capture_interval:
-                    if self.capture_callbacks:
-                        self._handle_photo_capture()
+                if current_time - last_capture_time >= _CAPTURE_INTERVAL_NS:
+                    if self._capture_workers:
+                        self._handle_photo_capture(self._simulated_capture_frame())
                     last_capture_time = current_time
                 
-                # Handle live streaming (every 0.1 seconds = 10 FPS)
-                if current_time - last_stream_time >= stream_interval:
-                    if self.stream_callbacks:
-                        self._handle_live_stream()
+                if current_time - last_stream_time >= _STREAM_INTERVAL_NS:
+                    if self._stream_workers:
+                        self._handle_live_stream(self._simulated_stream_frame())
                     last_stream_time = current_time
                 
-                # Small sleep to prevent CPU spinning
-                time.sleep(0.01)
-                
+                # Sleep until the next frame is due (or stop() is called)
+                next_due = min(last_capture_time + _CAPTURE_INTERVAL_NS, last_stream_time + _STREAM_INTERVAL_NS)
+                self._stop_event.wait(max(0, next_due - time.monotonic_ns()) / 1_000_000_000)
+            
             except Exception as e:
                 logger.error(f"❌ Error in capture loop: {e}")
-                time.sleep(0.5)
+                self._stop_event.wait(0.5)
+    
+    def _simulated_capture_frame(self):
+        """Simulated high-resolution photo frame"""
+        # Read-only and never changes, so every capture can share it
+        return self._sim_capture
+    
+    def _simulated_stream_frame(self):
+        """Simulated live stream frame with indicators"""
+        clock = datetime.now().strftime('%H:%M:%S')
+        
+        # The clock only changes once a second, so reuse the last frame
+        # until it does
+        if clock != self._sim_stream_clock:
+            # Copy so the clock is drawn without touching frames that
+            # callback workers may still be reading
+            array = self._sim_stream.copy()
+            cv2.putText(array, clock, 
+                       (50, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            array.setflags(write=False)
+            self._sim_stream_frame = array
+            self._sim_stream_clock = clock
+        
+        return self._sim_stream_frame
     
-    def _handle_photo_capture(self):
+    def _handle_photo_capture(self, array):
         """Handle photo capture for the main capture system"""
-        try:
-            if self.camera and CAMERA_AVAILABLE:
-                # Capture high-resolution image from main output
-                array = self.camera.capture_array("main")
-            else:
-                # Simulation mode
-                import numpy as np
-                array = np.random.randint(0, 255, (1080, 1920, 3), dtype=np.uint8)
-            
-            # Notify all capture callbacks
-            for callback in self.capture_callbacks[:]:
-                try:
-                    callback(array, "capture")
-                except Exception as e:
-                    logger.debug(f"⚠️  Capture callback error: {e}")
-                    
-        except Exception as e:
-            logger.debug(f"⚠️  Photo capture error: {e}")
+        # Every callback shares this one copy, so none may modify it
+        array.setflags(write=False)
+        
+        # Hand the frame to every capture callback's worker
+        for worker in self._capture_workers:
+            worker.submit(array)
     
-    def _handle_live_stream(self):
+    def _handle_live_stream(self, array):
         """Handle frame capture for live streaming"""
-        try:
-            if self.camera and CAMERA_AVAILABLE:
-                # Capture lower-resolution image from lores output
-                array = self.camera.capture_array("lores")
-            else:
-                # Simulation mode
-                import numpy as np
-                array = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
-                
-                # Add simulation indicators
-                import cv2
-                cv2.putText(array, "LIVE SIMULATION", (50, 50), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-                cv2.putText(array, f"{datetime.now().strftime('%H:%M:%S')}", 
-                           (50, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-            
-            # Notify all stream callbacks
-            for callback in self.stream_callbacks[:]:
-                try:
-                    callback(array, "stream")
-                except Exception as e:
-                    logger.debug(f"⚠️  Stream callback error: {e}")
-                    
-        except Exception as e:
-            logger.debug(f"⚠️  Live stream error: {e}")
+        # Every callback shares this one copy, so none may modify it
+        array.setflags(write=False)
+        
+        # Hand the frame to every stream callback's worker
+        for worker in self._stream_workers:
+            worker.submit(array)
     
     def get_camera_info(self):
         """Get camera information"""
-        if self.camera and CAMERA_AVAILABLE:
-            return {
-                "available": True,
-                "started": self.is_started,
-                "capture_callbacks": len(self.capture_callbacks),
-                "stream_callbacks": len(self.stream_callbacks)
-            }
-        else:
-            return {
-                "available": False,
-                "started": self.is_started,
-                "simulation": True,
-                "capture_callbacks": len(self.capture_callbacks),
-                "stream_callbacks": len(self.stream_callbacks)
-            }
-
-# Global instance
-_shared_manager = None
+        capture_workers = self._capture_workers
+        stream_workers = self._stream_workers
+        
+        # Camera vs simulation is fixed at construction; only the live
+        # counts need computing
+        return {
+            **self._info_base,
+            "started": self.is_started,
+            "capture_callbacks": len(capture_workers),
+            "stream_callbacks": len(stream_workers),
+            "dropped_capture_frames": sum(w.dropped for w in capture_workers),
+            "dropped_stream_frames": sum(w.dropped for w in stream_workers)
+        }
 
+@lru_cache(maxsize=1)
 def get_shared_camera() -> SharedCameraManager:
-    """Get the global shared camera manager"""
-    global _shared_manager
-    if _shared_manager is None:
-        _shared_manager = SharedCameraManager()
-    return _shared_manager
\ No newline at end of file
+    """Get the global shared camera manager (created on first call)"""
+    return SharedCameraManager()
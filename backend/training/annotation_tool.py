@@ -20,20 +20,147 @@ Keyboard Shortcuts:
 """
 
 import argparse
+import errno
 import logging
+import os
+import shutil
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from tkinter import ttk, messagebox
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from PIL import Image, ImageTk, ImageDraw, ImageFont
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Image file extensions to annotate (lowercase, without the dot)
+IMAGE_EXTENSIONS = frozenset({'jpg', 'jpeg', 'png', 'bmp', 'webp'})
+
+# Quiet period after the last canvas resize event before the image is refit
+RESIZE_DEBOUNCE_MS = 120
+
+# Concurrent file copies/deletes when adding images to the training set or
+# clearing the folder
+FILE_WORKERS = 8
+
+# Padding kept around the image inside the canvas
+CANVAS_PADDING = 20
+
+# copy_file_range() errors that mean "not possible here", not a real I/O failure
+_COPY_RANGE_UNSUPPORTED = frozenset({errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ETXTBSY})
+
+
+def _fast_copy(src: Path, dst: Path):
+    """
+    Copy a file's contents, letting the kernel clone it where it can
+    
+    copy_file_range() reflinks on copy-on-write filesystems (btrfs, XFS) and
+    otherwise copies inside the kernel. Where it isn't available (macOS,
+    older kernels, across filesystems), or it stops short of the size the
+    source reports (some FUSE and procfs-like files), shutil.copyfile()
+    does the copy.
+    
+    Args:
+        src: File to copy
+        dst: Destination file (overwritten if it exists)
+    """
+    if hasattr(os, 'copy_file_range'):
+        try:
+            src_fd = os.open(src, os.O_RDONLY | os.O_CLOEXEC)
+            try:
+                # Files reporting size 0 may still have content; copy those the slow way
+                remaining = os.fstat(src_fd).st_size or None
+                dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o666)
+                try:
+                    while remaining:
+                        copied = os.copy_file_range(src_fd, dst_fd, remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                finally:
+                    os.close(dst_fd)
+            finally:
+                os.close(src_fd)
+            if remaining == 0:
+                return
+        except OSError as e:
+            if e.errno not in _COPY_RANGE_UNSUPPORTED:
+                raise
+    
+    shutil.copyfile(src, dst)
+
+
+def _remove_file(path: Path, dir_fd: Optional[int] = None) -> bool:
+    """
+    Delete a file, treating one that's already gone as not deleted
+    
+    Args:
+        path: File to delete
+        dir_fd: Open handle on the file's directory; the name is then resolved
+            relative to it instead of walking the full path
+    
+    Returns:
+        True if the file was deleted
+    """
+    try:
+        if dir_fd is None:
+            os.unlink(path)
+        else:
+            os.unlink(path.name, dir_fd=dir_fd)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _fit_size(img_width: int, img_height: int, canvas_width: int, canvas_height: int) -> Tuple[int, int]:
+    """
+    Size to display an image at so it fits the canvas (never enlarged)
+    
+    Args:
+        img_width, img_height: Original image size
+        canvas_width, canvas_height: Current canvas size
+    
+    Returns:
+        (width, height) for the display image
+    """
+    max_width = canvas_width - CANVAS_PADDING * 2
+    max_height = canvas_height - CANVAS_PADDING * 2
+    
+    if max_width > 100 and max_height > 100:  # Canvas is initialized
+        scale = min(max_width / img_width, max_height / img_height, 1.0)
+    else:
+        # Fallback: resize to reasonable default
+        scale = min(800 / img_width, 600 / img_height, 1.0)
+    return (int(img_width * scale), int(img_height * scale))
+
+
+def _decode_display_image(image_path: Path, canvas_size: Tuple[int, int]) -> Tuple[Tuple[int, int], Image.Image]:
+    """
+    Decode an image scaled to fit the canvas (safe to run off the UI thread)
+    
+    Thumbnailing lets JPEGs use draft mode: the decoder scales by 1/2, 1/4
+    or 1/8 while staying at least twice the display size, and LANCZOS does
+    the rest.
+    
+    Args:
+        image_path: Image to decode
+        canvas_size: (width, height) of the canvas it will be shown on
+    
+    Returns:
+        Tuple of (fit size the image was scaled to, display image)
+    """
+    image = Image.open(image_path)
+    fit_size = _fit_size(image.width, image.height, *canvas_size)
+    image.thumbnail(fit_size, Image.Resampling.LANCZOS)
+    return fit_size, image
+
 
 class BoundingBox:
     """Represents a YOLO bounding box"""
     
+    __slots__ = ('class_id', 'x_center', 'y_center', 'width', 'height')
+    
     def __init__(self, class_id: int, x_center: float, y_center: float, width: float, height: float):
         """
         Initialize bounding box (YOLO normalized format)
@@ -62,11 +189,10 @@ class BoundingBox:
         Returns:
             Tuple of (x1, y1, x2, y2)
         """
-        x1 = int((self.x_center - self.width / 2) * img_width)
-        y1 = int((self.y_center - self.height / 2) * img_height)
-        x2 = int((self.x_center + self.width / 2) * img_width)
-        y2 = int((self.y_center + self.height / 2) * img_height)
-        return (x1, y1, x2, y2)
+        x_center, y_center = self.x_center, self.y_center
+        half_w, half_h = self.width * 0.5, self.height * 0.5
+        return (int((x_center - half_w) * img_width), int((y_center - half_h) * img_height),
+                int((x_center + half_w) * img_width), int((y_center + half_h) * img_height))
     
     @classmethod
     def from_pixel_coords(cls, class_id: int, x1: int, y1: int, x2: int, y2: int, 
@@ -83,11 +209,8 @@ class BoundingBox:
         Returns:
             BoundingBox instance
         """
-        x_center = ((x1 + x2) / 2) / img_width
-        y_center = ((y1 + y2) / 2) / img_height
-        width = (x2 - x1) / img_width
-        height = (y2 - y1) / img_height
-        return cls(class_id, x_center, y_center, width, height)
+        return cls(class_id, (x1 + x2) / 2 / img_width, (y1 + y2) / 2 / img_height,
+                   (x2 - x1) / img_width, (y2 - y1) / img_height)
     
     def to_yolo_string(self) -> str:
         """Convert to YOLO format string"""
@@ -120,9 +243,10 @@ class AnnotationTool:
                 raise ValueError("class_ids and class_names must have same length")
             self.class_ids = class_ids
         
-        self.class_name_to_id = {name: id for name, id in zip(class_names, self.class_ids)}
         self.class_id_to_name = {id: name for name, id in zip(class_names, self.class_ids)}
         
+        self.images: List[Path] = []
+        self._images_dirty = True  # Folder contents changed since the last scan
         self.images = self._find_images()
         self.current_index = 0
         
@@ -130,9 +254,12 @@ class AnnotationTool:
         self.boxes: List[BoundingBox] = []  # List of all boxes in current image
         self.selected_box_index: Optional[int] = None  # Which box is selected
         self.selected_class_id = self.class_ids[0] if self.class_ids else 0
+        self._saved_annotation: Optional[str] = None  # Current image's annotation file contents (None if missing)
         
         # Canvas state
         self.canvas_rects: List[int] = []  # Canvas rectangle IDs for all boxes
+        self._rect_coords: List[Tuple[int, int, int, int]] = []  # Canvas coords of each rectangle
+        self._draw_job = None  # Pending after_idle() job for a coalesced redraw
         self.drag_data = {"item": None, "x": 0, "y": 0}
         self.resize_handle = None
         self.creating_box = False  # Track if we're creating a new box
@@ -144,6 +271,32 @@ class AnnotationTool:
         self.img_width = 0
         self.img_height = 0
         
+        # Display geometry, cached by load_image so mouse handlers don't
+        # query Tk for it on every event
+        self._scale = 1.0  # Display pixels per image pixel
+        self._offset_x = 0  # Canvas position of the image's left edge
+        self._offset_y = 0  # Canvas position of the image's top edge
+        self._canvas_w = 0
+        self._canvas_h = 0
+        self._resize_job = None  # Pending after() job for a debounced refit
+        self._loading = False  # Set while load_image is flushing Tk's idle tasks
+        self._display_key = None  # (image path, display size) of display_image
+        self._canvas_image_id = None  # Canvas item showing photo_image
+        
+        # Label font for saved visualizations, parsed once
+        try:
+            self._label_font = ImageFont.truetype("arial.ttf", 16)
+        except OSError:
+            self._label_font = ImageFont.load_default()
+        
+        # Visualizations are encoded off the UI thread, one at a time
+        self._viz_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='visualization')
+        
+        # The images either side of the current one are decoded ahead of
+        # time, so navigating to them only has to build the PhotoImage
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='prefetch')
+        self._prefetched: Dict[Path, Tuple[Tuple[int, int], Future]] = {}  # path -> (canvas size, decode)
+        
         # GUI setup
         self.root = tk.Tk()
         self.root.title("Speed Annotation Tool")
@@ -159,24 +312,31 @@ class AnnotationTool:
             self.root.quit()
     
     def _find_images(self) -> List[Path]:
-        """Find all images in directory"""
-        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.webp'}
-        images = set()  # Use set to avoid duplicates
-        
-        for ext in image_extensions:
-            images.update(self.input_dir.glob(f'*{ext}'))
-            images.update(self.input_dir.glob(f'*{ext.upper()}'))
+        """Find all images in directory (rescans only after the tool changed the folder)"""
+        if not self._images_dirty:
+            return self.images
+        self._images_dirty = False
+        
+        # One directory pass; the extension check is case-insensitive
+        all_images = []
+        file_names = set()
+        with os.scandir(self.input_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                file_names.add(entry.name)
+                if entry.name.rpartition('.')[2].lower() in IMAGE_EXTENSIONS:
+                    all_images.append(Path(entry.path))
         
-        all_images = sorted(list(images))
+        all_images.sort()
         
         # Filter to only unannotated images if requested
         if self.unannotated_only:
             unannotated = []
             for img_path in all_images:
-                annotation_path = img_path.with_suffix('.txt')
                 # Include ONLY if annotation file doesn't exist at all (not yet reviewed)
                 # Excludes: images with boxes (non-empty .txt) AND negative examples (empty .txt)
-                if not annotation_path.exists():
+                if f"{img_path.stem}.txt" not in file_names:
                     unannotated.append(img_path)
             
             logger.info(f"🔍 Filtering to unannotated images (no .txt file): {len(unannotated)}/{len(all_images)}")
@@ -193,7 +353,7 @@ class AnnotationTool:
         # Class dropdown
         ttk.Label(control_frame, text="Class:", font=('Arial', 12, 'bold')).pack(side=tk.LEFT, padx=5)
         self.class_var = tk.StringVar(value=self.class_names[0] if self.class_names else "")
-        class_dropdown = ttk.Combobox(
+        self.class_dropdown = ttk.Combobox(
             control_frame, 
             textvariable=self.class_var, 
             values=self.class_names,
@@ -201,8 +361,8 @@ class AnnotationTool:
             width=20,
             font=('Arial', 12)
         )
-        class_dropdown.pack(side=tk.LEFT, padx=5)
-        class_dropdown.bind('<<ComboboxSelected>>', self._on_class_changed)
+        self.class_dropdown.pack(side=tk.LEFT, padx=5)
+        self.class_dropdown.bind('<<ComboboxSelected>>', self._on_class_changed)
         
         # Image counter
         self.counter_label = ttk.Label(control_frame, text="", font=('Arial', 12))
@@ -290,8 +450,12 @@ class AnnotationTool:
     
     def _on_class_changed(self, event):
         """Handle class dropdown change"""
-        selected_name = self.class_var.get()
-        self.selected_class_id = self.class_name_to_id[selected_name]
+        # Dropdown entries are in class_names order, so the index maps straight to the ID
+        index = self.class_dropdown.current()
+        if index < 0:
+            return
+        selected_name = self.class_names[index]
+        self.selected_class_id = self.class_ids[index]
         
         # Update selected box's class if one is selected
         if self.selected_box_index is not None and self.boxes:
@@ -338,45 +502,68 @@ class AnnotationTool:
         self.current_index = index
         image_path = self.images[index]
         
-        # Load image
+        # Load image (header only; pixels are decoded when first needed)
+        if self.original_image is not None:
+            self.original_image.close()
         self.original_image = Image.open(image_path)
         self.img_width, self.img_height = self.original_image.size
         
-        # Force canvas to update its size
-        self.canvas.update_idletasks()
+        # Force canvas to update its size. That can deliver Configure events,
+        # which must not queue another refit: the size read below is current
+        self._loading = True
+        try:
+            self.canvas.update_idletasks()
+        finally:
+            self._loading = False
         
         # Resize to fit canvas (with padding)
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
-        
-        padding = 20  # Padding around image
-        max_width = canvas_width - padding * 2
-        max_height = canvas_height - padding * 2
-        
-        if max_width > 100 and max_height > 100:  # Canvas is initialized
-            scale = min(max_width / self.img_width, max_height / self.img_height, 1.0)
-            new_width = int(self.img_width * scale)
-            new_height = int(self.img_height * scale)
-            self.display_image = self.original_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        new_size = _fit_size(self.img_width, self.img_height, canvas_width, canvas_height)
+        
+        # Refitting the same image to the same size (e.g. a window resize
+        # that doesn't change the fit) keeps the existing display image
+        display_key = (image_path, new_size)
+        if display_key != self._display_key:
+            # Use the prefetched decode if it was made for this size (waiting
+            # for it if it's still running); otherwise decode here. Only the
+            # PhotoImage has to be built on the UI thread
+            display_image = None
+            prefetched = self._prefetched.pop(image_path, None)
+            if prefetched is not None:
+                try:
+                    fit_size, display_image = prefetched[1].result()
+                    if fit_size != new_size:
+                        display_image = None
+                except Exception:
+                    display_image = None
+            if display_image is None:
+                _, display_image = _decode_display_image(image_path, (canvas_width, canvas_height))
+            
+            self.display_image = display_image
+            self.photo_image = ImageTk.PhotoImage(self.display_image)
+            self._display_key = display_key
+        
+        # Cache the display geometry for drawing and mouse handling
+        self._canvas_w = canvas_width
+        self._canvas_h = canvas_height
+        self._scale = self.display_image.width / self.img_width
+        self._offset_x = (canvas_width - self.display_image.width) // 2
+        self._offset_y = (canvas_height - self.display_image.height) // 2
+        
+        # Display image, reusing the canvas item after the first load (the
+        # old image's boxes are removed by the redraw _load_annotation queues)
+        if self._canvas_image_id is None:
+            self._canvas_image_id = self.canvas.create_image(
+                canvas_width // 2,
+                canvas_height // 2,
+                image=self.photo_image,
+                anchor=tk.CENTER,
+                tags='image'
+            )
         else:
-            # Fallback: resize to reasonable default
-            self.display_image = self.original_image.copy()
-            scale = min(800 / self.img_width, 600 / self.img_height, 1.0)
-            new_width = int(self.img_width * scale)
-            new_height = int(self.img_height * scale)
-            self.display_image = self.original_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
-        self.photo_image = ImageTk.PhotoImage(self.display_image)
-        
-        # Display image
-        self.canvas.delete('all')
-        self.canvas.create_image(
-            canvas_width // 2,
-            canvas_height // 2,
-            image=self.photo_image,
-            anchor=tk.CENTER,
-            tags='image'
-        )
+            self.canvas.itemconfig(self._canvas_image_id, image=self.photo_image)
+            self.canvas.coords(self._canvas_image_id, canvas_width // 2, canvas_height // 2)
         
         # Load annotation
         self._load_annotation(image_path)
@@ -384,6 +571,34 @@ class AnnotationTool:
         # Update UI
         self._update_counter()
         self._update_status(f"Loaded: {image_path.name}")
+        
+        self._prefetch_neighbors((canvas_width, canvas_height))
+    
+    def _prefetch_neighbors(self, canvas_size: Tuple[int, int]):
+        """
+        Start decoding the previous and next images in the background
+        
+        Args:
+            canvas_size: (width, height) of the canvas they will be fit to
+        """
+        neighbors = {
+            self.images[i]
+            for i in (self.current_index - 1, self.current_index + 1)
+            if 0 <= i < len(self.images)
+        }
+        
+        # Drop decodes for images that are no longer adjacent
+        for path in list(self._prefetched):
+            if path not in neighbors:
+                self._prefetched.pop(path)[1].cancel()
+        
+        for path in neighbors:
+            prefetched = self._prefetched.get(path)
+            if prefetched is None or prefetched[0] != canvas_size:
+                if prefetched is not None:
+                    prefetched[1].cancel()
+                future = self._prefetch_executor.submit(_decode_display_image, path, canvas_size)
+                self._prefetched[path] = (canvas_size, future)
     
     def _load_annotation(self, image_path: Path):
         """Load existing annotations for image (supports multiple boxes)"""
@@ -392,19 +607,15 @@ class AnnotationTool:
         # Clear existing boxes
         self.boxes = []
         self.selected_box_index = None
-        
-        if not annotation_path.exists():
-            self._draw_all_boxes()
-            self._update_box_list()
-            return
+        self._saved_annotation = None
         
         # Read all annotations (multiple boxes)
         try:
             with open(annotation_path, 'r') as f:
-                lines = f.readlines()
+                self._saved_annotation = f.read()
             
-            for line in lines:
-                parts = line.strip().split()
+            for line in self._saved_annotation.splitlines():
+                parts = line.split()
                 if len(parts) == 5:
                     class_id = int(parts[0])
                     x_center = float(parts[1])
@@ -427,6 +638,11 @@ class AnnotationTool:
             self._draw_all_boxes()
             self._update_box_list()
             
+        except FileNotFoundError:
+            # Not annotated yet
+            self._draw_all_boxes()
+            self._update_box_list()
+            
         except Exception as e:
             logger.warning(f"Failed to load annotation: {e}")
             self.boxes = []
@@ -435,26 +651,40 @@ class AnnotationTool:
             self._update_box_list()
     
     def _draw_all_boxes(self):
-        """Draw all bounding boxes on canvas, highlight selected"""
+        """Schedule a redraw of all boxes, coalescing repeated calls into one per event loop turn"""
+        if self._draw_job is None:
+            self._draw_job = self.root.after_idle(self._redraw_boxes)
+    
+    def _redraw_boxes(self):
+        """Draw all bounding boxes on canvas now, highlight selected"""
+        # A pending coalesced redraw would recreate the rectangles again
+        if self._draw_job is not None:
+            self.root.after_cancel(self._draw_job)
+            self._draw_job = None
+        
         # Clear old rectangles
         for rect_id in self.canvas_rects:
             self.canvas.delete(rect_id)
         self.canvas_rects = []
+        self._rect_coords = []
         
         if not self.boxes:
             return
         
+        scale = self._scale
+        offset_x = self._offset_x
+        offset_y = self._offset_y
+        
         # Draw each box
         for i, box in enumerate(self.boxes):
             # Convert to pixel coordinates
             x1, y1, x2, y2 = box.to_pixel_coords(self.img_width, self.img_height)
             
             # Scale to display size
-            scale = self.display_image.width / self.img_width
-            x1 = int(x1 * scale) + (self.canvas.winfo_width() - self.display_image.width) // 2
-            y1 = int(y1 * scale) + (self.canvas.winfo_height() - self.display_image.height) // 2
-            x2 = int(x2 * scale) + (self.canvas.winfo_width() - self.display_image.width) // 2
-            y2 = int(y2 * scale) + (self.canvas.winfo_height() - self.display_image.height) // 2
+            x1 = int(x1 * scale) + offset_x
+            y1 = int(y1 * scale) + offset_y
+            x2 = int(x2 * scale) + offset_x
+            y2 = int(y2 * scale) + offset_y
             
             # Highlight selected box differently
             is_selected = (i == self.selected_box_index)
@@ -469,63 +699,63 @@ class AnnotationTool:
                 tags=f'bbox_{i}'
             )
             self.canvas_rects.append(rect_id)
+            self._rect_coords.append((x1, y1, x2, y2))
     
     def _on_canvas_click(self, event):
         """Handle canvas click - select box or create new one"""
         # Check if clicking on any existing box (check in reverse order for top-most)
         clicked_box_index = None
         
-        for i in range(len(self.canvas_rects) - 1, -1, -1):
-            rect_id = self.canvas_rects[i]
-            bbox = self.canvas.bbox(rect_id)
-            if bbox:
-                x1, y1, x2, y2 = bbox
-                margin = 15  # Larger margin for easier grabbing
+        for i in range(len(self._rect_coords) - 1, -1, -1):
+            x1, y1, x2, y2 = self._rect_coords[i]
+            margin = 15  # Larger margin for easier grabbing
+            
+            # Check if click is on box edges (resize) or inside (move)
+            on_left = abs(event.x - x1) < margin and y1 - margin <= event.y <= y2 + margin
+            on_right = abs(event.x - x2) < margin and y1 - margin <= event.y <= y2 + margin
+            on_top = abs(event.y - y1) < margin and x1 - margin <= event.x <= x2 + margin
+            on_bottom = abs(event.y - y2) < margin and x1 - margin <= event.x <= x2 + margin
+            
+            if on_left or on_right or on_top or on_bottom:
+                # Resize mode
+                clicked_box_index = i
+                self.selected_box_index = i
+                self.resize_handle = {'left': on_left, 'right': on_right, 'top': on_top, 'bottom': on_bottom}
                 
-                # Check if click is on box edges (resize) or inside (move)
-                on_left = abs(event.x - x1) < margin and y1 - margin <= event.y <= y2 + margin
-                on_right = abs(event.x - x2) < margin and y1 - margin <= event.y <= y2 + margin
-                on_top = abs(event.y - y1) < margin and x1 - margin <= event.x <= x2 + margin
-                on_bottom = abs(event.y - y2) < margin and x1 - margin <= event.x <= x2 + margin
+                # Redraw right away (recreates the rectangles, so take the new ID after)
+                self._redraw_boxes()
+                self._update_box_list()
+                self.drag_data = {"item": self.canvas_rects[i], "x": event.x, "y": event.y, "resize": True,
+                                  "box_index": i, "coords": (x1, y1, x2, y2)}
                 
-                if on_left or on_right or on_top or on_bottom:
-                    # Resize mode
-                    clicked_box_index = i
-                    self.selected_box_index = i
-                    self.resize_handle = {'left': on_left, 'right': on_right, 'top': on_top, 'bottom': on_bottom}
-                    self.drag_data = {"item": rect_id, "x": event.x, "y": event.y, "resize": True, "box_index": i}
-                    
-                    # Update UI
-                    self._draw_all_boxes()
-                    self._update_box_list()
-                    
-                    # Change cursor
-                    if on_left and on_top:
-                        self.canvas.config(cursor="top_left_corner")
-                    elif on_right and on_top:
-                        self.canvas.config(cursor="top_right_corner")
-                    elif on_left and on_bottom:
-                        self.canvas.config(cursor="bottom_left_corner")
-                    elif on_right and on_bottom:
-                        self.canvas.config(cursor="bottom_right_corner")
-                    elif on_left or on_right:
-                        self.canvas.config(cursor="sb_h_double_arrow")
-                    elif on_top or on_bottom:
-                        self.canvas.config(cursor="sb_v_double_arrow")
-                    return
-                    
-                elif x1 <= event.x <= x2 and y1 <= event.y <= y2:
-                    # Inside box - select and prepare to move
-                    clicked_box_index = i
-                    self.selected_box_index = i
-                    self.drag_data = {"item": rect_id, "x": event.x, "y": event.y, "resize": False, "box_index": i}
-                    
-                    # Update UI
-                    self._draw_all_boxes()
-                    self._update_box_list()
-                    
-                    self.canvas.config(cursor="fleur")
-                    return
+                # Change cursor
+                if on_left and on_top:
+                    self.canvas.config(cursor="top_left_corner")
+                elif on_right and on_top:
+                    self.canvas.config(cursor="top_right_corner")
+                elif on_left and on_bottom:
+                    self.canvas.config(cursor="bottom_left_corner")
+                elif on_right and on_bottom:
+                    self.canvas.config(cursor="bottom_right_corner")
+                elif on_left or on_right:
+                    self.canvas.config(cursor="sb_h_double_arrow")
+                elif on_top or on_bottom:
+                    self.canvas.config(cursor="sb_v_double_arrow")
+                return
+                
+            elif x1 <= event.x <= x2 and y1 <= event.y <= y2:
+                # Inside box - select and prepare to move
+                clicked_box_index = i
+                self.selected_box_index = i
+                
+                # Redraw right away (recreates the rectangles, so take the new ID after)
+                self._redraw_boxes()
+                self._update_box_list()
+                self.drag_data = {"item": self.canvas_rects[i], "x": event.x, "y": event.y, "resize": False,
+                                  "box_index": i, "coords": (x1, y1, x2, y2)}
+                
+                self.canvas.config(cursor="fleur")
+                return
         
         # No box clicked - start creating new box
         self._start_box_creation(event.x, event.y)
@@ -536,7 +766,7 @@ class AnnotationTool:
         self.creating_box = True
         
         # Store start position
-        self.drag_data = {"x": x, "y": y, "creating": True}
+        self.drag_data = {"x": x, "y": y, "creating": True, "coords": (x, y, x, y)}
         
         # Create initial rectangle (single point) - will be added to canvas_rects temporarily
         temp_rect = self.canvas.create_rectangle(
@@ -559,6 +789,7 @@ class AnnotationTool:
                 start_y = self.drag_data["y"]
                 # Draw from top-left (start) to bottom-right (current)
                 self.canvas.coords(temp_rect, start_x, start_y, event.x, event.y)
+                self.drag_data["coords"] = (start_x, start_y, event.x, event.y)
             return
         
         if not self.drag_data.get("item"):
@@ -571,37 +802,32 @@ class AnnotationTool:
         rect_id = self.drag_data["item"]
         
         if self.drag_data.get("resize"):
-            # Resize box
-            bbox = self.canvas.bbox(rect_id)
-            if bbox:
-                x1, y1, x2, y2 = bbox
-                
-                # Store original opposite edges
-                if "orig_bbox" not in self.drag_data:
-                    self.drag_data["orig_bbox"] = (x1, y1, x2, y2)
-                
-                orig_x1, orig_y1, orig_x2, orig_y2 = self.drag_data["orig_bbox"]
-                
-                # Modify edges being dragged
-                new_x1 = event.x if self.resize_handle.get('left') else orig_x1
-                new_x2 = event.x if self.resize_handle.get('right') else orig_x2
-                new_y1 = event.y if self.resize_handle.get('top') else orig_y1
-                new_y2 = event.y if self.resize_handle.get('bottom') else orig_y2
-                
-                # Ensure x1 < x2 and y1 < y2
-                if new_x1 > new_x2:
-                    new_x1, new_x2 = new_x2, new_x1
-                if new_y1 > new_y2:
-                    new_y1, new_y2 = new_y2, new_y1
-                
-                # Ensure minimum size
-                if new_x2 - new_x1 >= 20 and new_y2 - new_y1 >= 20:
-                    self.canvas.coords(rect_id, new_x1, new_y1, new_x2, new_y2)
+            # Resize box, keeping the edges that aren't being dragged where they started
+            orig_x1, orig_y1, orig_x2, orig_y2 = self._rect_coords[box_index]
+            
+            # Modify edges being dragged
+            new_x1 = event.x if self.resize_handle.get('left') else orig_x1
+            new_x2 = event.x if self.resize_handle.get('right') else orig_x2
+            new_y1 = event.y if self.resize_handle.get('top') else orig_y1
+            new_y2 = event.y if self.resize_handle.get('bottom') else orig_y2
+            
+            # Ensure x1 < x2 and y1 < y2
+            if new_x1 > new_x2:
+                new_x1, new_x2 = new_x2, new_x1
+            if new_y1 > new_y2:
+                new_y1, new_y2 = new_y2, new_y1
+            
+            # Ensure minimum size
+            if new_x2 - new_x1 >= 20 and new_y2 - new_y1 >= 20:
+                self.canvas.coords(rect_id, new_x1, new_y1, new_x2, new_y2)
+                self.drag_data["coords"] = (new_x1, new_y1, new_x2, new_y2)
         else:
             # Move box
             dx = event.x - self.drag_data["x"]
             dy = event.y - self.drag_data["y"]
             self.canvas.move(rect_id, dx, dy)
+            x1, y1, x2, y2 = self.drag_data["coords"]
+            self.drag_data["coords"] = (x1 + dx, y1 + dy, x2 + dx, y2 + dy)
             self.drag_data["x"] = event.x
             self.drag_data["y"] = event.y
     
@@ -613,23 +839,21 @@ class AnnotationTool:
             temp_rect = self.drag_data.get("temp_rect")
             
             if temp_rect:
-                bbox = self.canvas.bbox(temp_rect)
-                if bbox:
-                    x1, y1, x2, y2 = bbox
-                    
-                    # Ensure x1 < x2 and y1 < y2
-                    if x1 > x2:
-                        x1, x2 = x2, x1
-                    if y1 > y2:
-                        y1, y2 = y2, y1
-                    
-                    # Check minimum size
-                    if x2 - x1 >= 10 and y2 - y1 >= 10:
-                        # Convert to image coordinates and create box
-                        self._create_box_from_canvas_coords(x1, y1, x2, y2)
-                        self._update_status("Created new bounding box")
-                    else:
-                        self._update_status("Box too small - cancelled")
+                x1, y1, x2, y2 = self.drag_data["coords"]
+                
+                # Ensure x1 < x2 and y1 < y2
+                if x1 > x2:
+                    x1, x2 = x2, x1
+                if y1 > y2:
+                    y1, y2 = y2, y1
+                
+                # Check minimum size
+                if x2 - x1 >= 10 and y2 - y1 >= 10:
+                    # Convert to image coordinates and create box
+                    self._create_box_from_canvas_coords(x1, y1, x2, y2)
+                    self._update_status("Created new bounding box")
+                else:
+                    self._update_status("Box too small - cancelled")
                 
                 # Delete temporary rectangle
                 self.canvas.delete(temp_rect)
@@ -642,11 +866,9 @@ class AnnotationTool:
         if self.drag_data.get("item"):
             box_index = self.drag_data.get("box_index")
             if box_index is not None and box_index < len(self.boxes):
-                rect_id = self.drag_data["item"]
-                bbox = self.canvas.bbox(rect_id)
-                if bbox:
-                    x1, y1, x2, y2 = bbox
-                    self._update_box_from_canvas_coords(x1, y1, x2, y2, box_index)
+                x1, y1, x2, y2 = self.drag_data["coords"]
+                self._rect_coords[box_index] = (x1, y1, x2, y2)
+                self._update_box_from_canvas_coords(x1, y1, x2, y2, box_index)
         
         self.drag_data = {"item": None, "x": 0, "y": 0}
         self.resize_handle = None
@@ -655,9 +877,9 @@ class AnnotationTool:
     def _create_box_from_canvas_coords(self, x1: int, y1: int, x2: int, y2: int):
         """Create NEW box from canvas coordinates and add to boxes list"""
         # Convert canvas coords to image coords
-        scale = self.display_image.width / self.img_width
-        offset_x = (self.canvas.winfo_width() - self.display_image.width) // 2
-        offset_y = (self.canvas.winfo_height() - self.display_image.height) // 2
+        scale = self._scale
+        offset_x = self._offset_x
+        offset_y = self._offset_y
         
         img_x1 = int((x1 - offset_x) / scale)
         img_y1 = int((y1 - offset_y) / scale)
@@ -694,9 +916,9 @@ class AnnotationTool:
             return
         
         # Convert canvas coords to image coords
-        scale = self.display_image.width / self.img_width
-        offset_x = (self.canvas.winfo_width() - self.display_image.width) // 2
-        offset_y = (self.canvas.winfo_height() - self.display_image.height) // 2
+        scale = self._scale
+        offset_x = self._offset_x
+        offset_y = self._offset_y
         
         img_x1 = int((x1 - offset_x) / scale)
         img_y1 = int((y1 - offset_y) / scale)
@@ -718,10 +940,23 @@ class AnnotationTool:
         self.boxes[box_index] = updated_box
     
     def _on_canvas_resize(self, event):
-        """Handle canvas resize - redraw image"""
-        if self.original_image and event.width > 100 and event.height > 100:
-            # Reload current image to fit new canvas size
-            self.load_image(self.current_index)
+        """Handle canvas resize - redraw image once resizing settles"""
+        if self._loading or not (self.original_image and event.width > 100 and event.height > 100):
+            return
+        
+        # Configure also fires when nothing about the size changed
+        if event.width == self._canvas_w and event.height == self._canvas_h:
+            return
+        
+        # A window drag sends a flood of Configure events; refit once after the last
+        if self._resize_job is not None:
+            self.root.after_cancel(self._resize_job)
+        self._resize_job = self.root.after(RESIZE_DEBOUNCE_MS, self._refit_image)
+    
+    def _refit_image(self):
+        """Reload current image to fit new canvas size"""
+        self._resize_job = None
+        self.load_image(self.current_index)
     
     def save_annotation(self):
         """Save all annotations to file (or create empty file for negative examples)"""
@@ -731,85 +966,65 @@ class AnnotationTool:
         image_path = self.images[self.current_index]
         annotation_path = image_path.with_suffix('.txt')
         
+        # All boxes, one per line (empty for a negative example)
+        content = ''.join(box.to_yolo_string() + '\n' for box in self.boxes)
+        
+        # Scrubbing through images with the arrow keys saves every one;
+        # leave the file (and its visualization) alone if nothing changed
+        if content == self._saved_annotation:
+            self._update_status(f"✅ No changes: {annotation_path.name}")
+            return
+        
         try:
+            with open(annotation_path, 'w') as f:
+                f.write(content)
+            self._saved_annotation = content
+            
             if self.boxes:
-                # Save all boxes (one per line)
-                with open(annotation_path, 'w') as f:
-                    for box in self.boxes:
-                        f.write(box.to_yolo_string() + '\n')
                 self._update_status(f"✅ Saved {len(self.boxes)} annotation(s): {annotation_path.name}")
                 
-                # Create visualization
-                self._save_visualization(image_path, annotation_path)
+                # Create visualization in the background from a snapshot of the boxes
+                boxes = [(box.class_id, box.to_pixel_coords(self.img_width, self.img_height))
+                         for box in self.boxes]
+                self._viz_executor.submit(self._save_visualization, image_path, boxes)
             else:
-                # No boxes - create EMPTY file as negative example
+                # No boxes - the file is left EMPTY as a negative example
                 # This tells YOLO: "This image was reviewed and contains NO objects"
-                with open(annotation_path, 'w') as f:
-                    pass  # Empty file
                 self._update_status(f"✅ Saved as negative example (empty annotation): {annotation_path.name}")
         except Exception as e:
             logger.error(f"Failed to save annotation: {e}")
             messagebox.showerror("Save Error", f"Failed to save annotation: {e}")
     
-    def _save_visualization(self, image_path: Path, annotation_path: Path):
-        """Save a visualization of the annotations (all boxes)"""
+    def _save_visualization(self, image_path: Path, boxes: List[Tuple[int, Tuple[int, int, int, int]]]):
+        """
+        Save a visualization of the annotations (runs on the visualization thread)
+        
+        Args:
+            image_path: Annotated image
+            boxes: (class_id, (x1, y1, x2, y2)) pixel boxes to draw
+        """
         try:
             # Create annotation_check directory next to to_annotate
             viz_dir = self.input_dir.parent / 'annotation_check'
             viz_dir.mkdir(parents=True, exist_ok=True)
             
-            # Load original image
+            # Decode here rather than sharing original_image, which the UI
+            # thread closes when it moves to the next image
             image = Image.open(image_path)
             draw = ImageDraw.Draw(image)
             
-            img_width, img_height = image.size
-            
-            # Parse all annotations
-            with open(annotation_path, 'r') as f:
-                lines = f.readlines()
-            
             # Draw each box
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                parts = line.split()
-                if len(parts) < 5:
-                    continue
-                    
-                class_id = int(parts[0])
-                x_center = float(parts[1])
-                y_center = float(parts[2])
-                width = float(parts[3])
-                height = float(parts[4])
-                
-                # Convert to pixel coordinates
-                x_center_px = x_center * img_width
-                y_center_px = y_center * img_height
-                width_px = width * img_width
-                height_px = height * img_height
-                
-                x1 = int(x_center_px - width_px / 2)
-                y1 = int(y_center_px - height_px / 2)
-                x2 = int(x_center_px + width_px / 2)
-                y2 = int(y_center_px + height_px / 2)
-                
+            for class_id, (x1, y1, x2, y2) in boxes:
                 # Get class name
                 class_name = self.class_id_to_name.get(class_id, f"class_{class_id}")
                 
                 # Draw green box
                 color = (0, 255, 0)  # Green
-                for i in range(3):
-                    draw.rectangle([x1 + i, y1 + i, x2 - i, y2 - i], outline=color)
+                draw.rectangle([x1, y1, x2, y2], outline=color, width=3)
                 
                 # Draw label
                 label = f"{class_name} (ID:{class_id})"
-                
-                try:
-                    font = ImageFont.truetype("arial.ttf", 16)
-                except:
-                    font = ImageFont.load_default()
+                font = self._label_font
                 
                 bbox = draw.textbbox((0, 0), label, font=font)
                 text_width = bbox[2] - bbox[0]
@@ -821,11 +1036,12 @@ class AnnotationTool:
                     fill=color
                 )
                 draw.text((x1 + 2, label_y + 2), label, fill=(255, 255, 255), font=font)
-                
-                # Save visualization
-                viz_path = viz_dir / f"annotated_{image_path.name}"
-                image.save(viz_path, "JPEG", quality=95)
-                logger.info(f"📸 Saved visualization: {viz_path}")
+            
+            # Save visualization (once all boxes are drawn). These are only
+            # for checking box placement, so favour encode speed over quality
+            viz_path = viz_dir / f"annotated_{image_path.name}"
+            image.save(viz_path, "JPEG", quality=85, optimize=False, progressive=False, subsampling=2)
+            logger.info(f"📸 Saved visualization: {viz_path}")
         
         except Exception as e:
             logger.warning(f"Failed to save visualization: {e}")
@@ -901,12 +1117,12 @@ class AnnotationTool:
         dest_dir.mkdir(parents=True, exist_ok=True)
         
         # Count annotated images (including negative examples with empty .txt files)
-        annotated_images = []
-        for image_path in self.images:
-            annotation_path = image_path.with_suffix('.txt')
-            # Include if annotation file exists (even if empty - those are negative examples)
-            if annotation_path.exists():
-                annotated_images.append(image_path)
+        annotations = self._annotation_paths()
+        annotated_images = [
+            (image_path, annotations[image_path.stem])
+            for image_path in self.images
+            if image_path.stem in annotations
+        ]
         
         if not annotated_images:
             messagebox.showwarning("No Annotations", "No annotated images found to add to training set.")
@@ -921,24 +1137,21 @@ class AnnotationTool:
         if not result:
             return
         
-        # Copy files
+        # Copy files (contents only; copy2() would also copy timestamps and
+        # permissions, which training doesn't use)
         copied_count = 0
-        import shutil
         
         try:
-            for image_path in annotated_images:
-                annotation_path = image_path.with_suffix('.txt')
-                
-                # Copy image (overwrite if exists)
-                dest_image = dest_dir / image_path.name
-                shutil.copy2(str(image_path), str(dest_image))
-                
-                # Copy annotation (overwrite if exists)
-                dest_annotation = dest_dir / annotation_path.name
-                shutil.copy2(str(annotation_path), str(dest_annotation))
-                
-                copied_count += 1
-                logger.info(f"✅ Copied {image_path.name} and annotation to training set")
+            # Copies are I/O-bound and release the GIL, so threads overlap them
+            with ThreadPoolExecutor(max_workers=min(FILE_WORKERS, len(annotated_images))) as executor:
+                futures = {
+                    executor.submit(self._copy_to_training_set, image_path, annotation_path, dest_dir): image_path
+                    for image_path, annotation_path in annotated_images
+                }
+                for future in as_completed(futures):
+                    future.result()
+                    copied_count += 1
+                    logger.info(f"✅ Copied {futures[future].name} and annotation to training set")
             
             # Show success message
             messagebox.showinfo(
@@ -952,6 +1165,32 @@ class AnnotationTool:
             logger.error(f"Failed to copy files: {e}")
             messagebox.showerror("Error", f"Failed to copy files to training set:\n{e}")
     
+    def _annotation_paths(self) -> Dict[str, Path]:
+        """
+        Find the annotation files currently in the folder (one directory pass)
+        
+        Returns:
+            Dict mapping image stem to its .txt annotation path
+        """
+        with os.scandir(self.input_dir) as entries:
+            return {
+                entry.name[:-4]: Path(entry.path)
+                for entry in entries
+                if entry.name.endswith('.txt') and entry.is_file()
+            }
+    
+    def _copy_to_training_set(self, image_path: Path, annotation_path: Path, dest_dir: Path):
+        """
+        Copy an image and its annotation into the training set (overwriting)
+        
+        Args:
+            image_path: Annotated image
+            annotation_path: Its .txt annotation
+            dest_dir: Training set folder
+        """
+        _fast_copy(image_path, dest_dir / image_path.name)
+        _fast_copy(annotation_path, dest_dir / annotation_path.name)
+    
     def clear_folder(self):
         """Clear all images and annotations from the to_annotate folder"""
         if not self.images:
@@ -960,7 +1199,8 @@ class AnnotationTool:
         
         # Count total files (images + annotations)
         total_files = len(self.images)
-        annotation_count = sum(1 for img in self.images if img.with_suffix('.txt').exists())
+        annotations = self._annotation_paths()
+        annotation_count = sum(1 for img in self.images if img.stem in annotations)
         
         # Confirm action
         result = messagebox.askyesno(
@@ -982,22 +1222,29 @@ class AnnotationTool:
         if not result2:
             return
         
-        # Delete files
-        deleted_images = 0
-        deleted_annotations = 0
+        # Whatever happens below, the folder no longer matches self.images
+        self._images_dirty = True
+        
+        # Release the open handle on the current image before deleting it
+        if self.original_image is not None:
+            self.original_image.close()
+            self.original_image = None
         
         try:
-            for image_path in self.images:
-                # Delete image
-                if image_path.exists():
-                    image_path.unlink()
-                    deleted_images += 1
-                
-                # Delete annotation
-                annotation_path = image_path.with_suffix('.txt')
-                if annotation_path.exists():
-                    annotation_path.unlink()
-                    deleted_annotations += 1
+            # Delete files. Every file is in input_dir, so where the platform
+            # allows it, names are resolved against one open directory handle
+            annotation_paths = [annotations[img.stem] for img in self.images if img.stem in annotations]
+            dir_fd = os.open(self.input_dir, os.O_RDONLY | os.O_DIRECTORY) if os.unlink in os.supports_dir_fd else None
+            try:
+                # Unlinks release the GIL, so threads overlap them
+                with ThreadPoolExecutor(max_workers=FILE_WORKERS) as executor:
+                    image_results = executor.map(_remove_file, self.images, [dir_fd] * len(self.images))
+                    annotation_results = executor.map(_remove_file, annotation_paths, [dir_fd] * len(annotation_paths))
+                    deleted_images = sum(image_results)
+                    deleted_annotations = sum(annotation_results)
+            finally:
+                if dir_fd is not None:
+                    os.close(dir_fd)
             
             logger.info(f"🗑️ Deleted {deleted_images} images and {deleted_annotations} annotations")
             
@@ -1012,8 +1259,15 @@ class AnnotationTool:
             self.current_index = 0
             self.boxes = []
             self.selected_box_index = None
+            self._saved_annotation = None
             self.canvas_rects = []
+            self._rect_coords = []
             self.canvas.delete('all')
+            self._canvas_image_id = None
+            self._display_key = None
+            for _, future in self._prefetched.values():
+                future.cancel()
+            self._prefetched.clear()
             self._update_status("Folder cleared")
         
         except Exception as e:
@@ -1023,6 +1277,11 @@ class AnnotationTool:
     def run(self):
         """Start GUI main loop"""
         self.root.mainloop()
+        
+        # Prefetched images are no longer needed; let queued
+        # visualizations finish writing
+        self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+        self._viz_executor.shutdown(wait=True)
 
 
 def main():
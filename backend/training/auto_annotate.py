@@ -8,14 +8,21 @@ Users can then manually correct these annotations using annotation_tool.py.
 
 import argparse
 import logging
+import os
+from collections import Counter
 from pathlib import Path
 from typing import List, Tuple
 from ultralytics import YOLO
-from PIL import Image
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Image file extensions to annotate (lowercase)
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.webp'})
+
+# Images per inference batch in annotate_directory
+PREDICT_BATCH_SIZE = 16
+
 
 class AutoAnnotator:
     """Automatically annotate images using pre-trained YOLO model"""
@@ -53,14 +60,17 @@ class AutoAnnotator:
         Returns:
             List of image paths
         """
-        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.webp'}
-        images = []
-        
-        for ext in image_extensions:
-            images.extend(input_dir.glob(f'*{ext}'))
-            images.extend(input_dir.glob(f'*{ext.upper()}'))
+        # One directory pass; is_file() uses the type readdir already returned
+        # (only symlinks cost an extra stat)
+        with os.scandir(input_dir) as entries:
+            images = [
+                Path(entry.path) for entry in entries
+                if entry.is_file()
+                and os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS
+            ]
         
-        return sorted(images)
+        images.sort()
+        return images
     
     def annotate_image(self, image_path: Path) -> Tuple[int, Path]:
         """
@@ -85,46 +95,53 @@ class AutoAnnotator:
             logger.error(f"❌ Detection failed for {image_path.name}: {e}")
             return (0, annotation_path)
         
-        # Get image dimensions
-        img = Image.open(image_path)
-        img_width, img_height = img.size
-        
-        # Extract detections and convert to YOLO format
-        annotations = []
-        for result in results:
-            boxes = result.boxes
-            for box in boxes:
-                # Get box coordinates (xyxy format)
-                x1, y1, x2, y2 = box.xyxy[0].tolist()
-                
-                # Convert to YOLO format (normalized x_center, y_center, width, height)
-                x_center = ((x1 + x2) / 2) / img_width
-                y_center = ((y1 + y2) / 2) / img_height
-                width = (x2 - x1) / img_width
-                height = (y2 - y1) / img_height
-                
-                # Get class ID and confidence
-                class_id = int(box.cls[0])
-                conf = float(box.conf[0])
-                
-                # Format: class_id x_center y_center width height
-                annotation = f"{class_id} {x_center:.6f} {y_center:.6f} {width:.6f} {height:.6f}"
-                annotations.append(annotation)
-                
-                class_name = self.model.names[class_id]
-                logger.info(f"   📍 Detected {class_name} (class {class_id}) at {conf:.2%} confidence")
+        # Unreadable images are skipped by the loader rather than raising
+        if not results:
+            logger.error(f"❌ Detection failed for {image_path.name}: image could not be read")
+            return (0, annotation_path)
+        
+        return (self._write_annotations(image_path, results[0]), annotation_path)
+    
+    def _write_annotations(self, image_path: Path, result) -> int:
+        """
+        Convert one image's detections to YOLO format and save them
+        
+        Args:
+            image_path: Path to image file
+            result: Ultralytics result for the image
+            
+        Returns:
+            Number of annotations written
+        """
+        annotation_path = image_path.with_suffix('.txt')
+        
+        # Pull whole tensors once; xywhn is already normalized to the
+        # original image size (center x, center y, width, height)
+        xywhn = result.boxes.xywhn.cpu().numpy().tolist()
+        class_ids = result.boxes.cls.cpu().numpy().astype(int).tolist()
+        
+        # Format: class_id x_center y_center width height
+        annotations = [
+            f"{class_id} {x_center:.6f} {y_center:.6f} {width:.6f} {height:.6f}"
+            for class_id, (x_center, y_center, width, height) in zip(class_ids, xywhn)
+        ]
+        
+        # Per-image detail is DEBUG; annotate_directory logs one line per batch
+        if annotations and logger.isEnabledFor(logging.DEBUG):
+            counts = Counter(self.model.names[class_id] for class_id in class_ids)
+            logger.debug(f"   📍 Detected {', '.join(f'{count} {name}' for name, count in counts.items())}")
         
         # Save annotations to file
         if annotations:
             with open(annotation_path, 'w') as f:
                 f.write('\n'.join(annotations))
-            logger.info(f"✅ Saved {len(annotations)} annotation(s) to {annotation_path.name}")
+            logger.debug(f"✅ Saved {len(annotations)} annotation(s) to {annotation_path.name}")
         else:
-            logger.warning(f"⚠️  No objects detected in {image_path.name}")
+            logger.debug(f"⚠️  No objects detected in {image_path.name}")
             # Create empty annotation file
             annotation_path.touch()
         
-        return (len(annotations), annotation_path)
+        return len(annotations)
     
     def annotate_directory(self, input_dir: Path, skip_existing: bool = True) -> dict:
         """
@@ -152,26 +169,95 @@ class AutoAnnotator:
         
         logger.info(f"📸 Found {len(images)} image(s) in {input_dir}")
         logger.info(f"🎯 Confidence threshold: {self.confidence}")
-        logger.info("")
+        
+        # Drop images that already have annotations before running the model
+        pending = []
+        for image_path in images:
+            if skip_existing and image_path.with_suffix('.txt').exists():
+                logger.debug(f"⏭️  Skipping {image_path.name} (annotation already exists)")
+            else:
+                pending.append(image_path)
         
         # Process each image
         total_detections = 0
         annotated_count = 0
-        skipped_count = 0
+        skipped_count = len(images) - len(pending)
         
-        for i, image_path in enumerate(images, 1):
-            logger.info(f"[{i}/{len(images)}] Processing: {image_path.name}")
-            
-            num_detections, annotation_path = self.annotate_image(image_path)
+        if skipped_count:
+            logger.info(f"⏭️  Skipping {skipped_count} image(s) (annotation already exists)")
+        
+        # One streaming predict call, batched, so model setup happens once
+        # and images are preprocessed and inferred PREDICT_BATCH_SIZE at a time.
+        # Ultralytics sorts list sources and drops images it can't read, so
+        # results are matched to images by result.path, never by position
+        remaining = {str(path.absolute()): path for path in pending}
+        
+        # One progress line per batch rather than per image
+        processed = 0
+        batch_start = 1
+        batch_detections = 0
+        batch_empty = 0
+        
+        try:
+            results = self.model(
+                list(remaining),
+                conf=self.confidence,
+                batch=PREDICT_BATCH_SIZE,
+                stream=True,
+                verbose=False
+            ) if remaining else []
             
-            if annotation_path.exists() and annotation_path.stat().st_size > 0:
+            for result in results:
+                image_path = remaining.pop(result.path, None) or Path(result.path)
+                processed += 1
+                
+                try:
+                    num_detections = self._write_annotations(image_path, result)
+                except Exception as e:
+                    logger.error(f"❌ Failed to save annotations for {image_path.name}: {e}")
+                    num_detections = 0
+                
                 if num_detections > 0:
                     total_detections += num_detections
                     annotated_count += 1
+                    batch_detections += num_detections
                 else:
-                    skipped_count += 1
+                    batch_empty += 1
+                
+                if processed % PREDICT_BATCH_SIZE == 0:
+                    logger.info(
+                        f"[{batch_start}-{processed}/{len(pending)}] Processed batch: "
+                        f"{batch_detections} detection(s), {batch_empty} image(s) with none"
+                    )
+                    batch_start = processed + 1
+                    batch_detections = 0
+                    batch_empty = 0
+        except Exception as e:
+            logger.error(f"❌ Batched detection failed: {e}")
             
-            logger.info("")
+            # The stream can't resume after an error; finish the rest one
+            # image at a time so one bad image doesn't stop the run
+            for image_path in list(remaining.values()):
+                num_detections, _ = self.annotate_image(image_path)
+                remaining.pop(str(image_path.absolute()))
+                processed += 1
+                if num_detections > 0:
+                    total_detections += num_detections
+                    annotated_count += 1
+                    batch_detections += num_detections
+                else:
+                    batch_empty += 1
+        
+        if processed >= batch_start:
+            logger.info(
+                f"[{batch_start}-{processed}/{len(pending)}] Processed batch: "
+                f"{batch_detections} detection(s), {batch_empty} image(s) with none"
+            )
+        
+        # Whatever is left was never returned (unreadable images are skipped
+        # with only a warning); leave them unannotated, as before
+        for image_path in remaining.values():
+            logger.error(f"❌ Detection failed for {image_path.name}: image could not be read")
         
         # Summary
         stats = {
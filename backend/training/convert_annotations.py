@@ -11,8 +11,10 @@ Usage:
 
 import argparse
 import logging
+import os
+import re
 from pathlib import Path
-from typing import List, Tuple
+from typing import List
 
 # Configure logging
 logging.basicConfig(
@@ -40,30 +42,18 @@ class AnnotationConverter:
         self.files_processed = 0
         self.lines_converted = 0
 
-    def convert_line(self, line: str) -> Tuple[str, bool]:
-        """
-        Convert a single annotation line
-
-        Args:
-            line: YOLO annotation line (e.g., "80 0.5 0.5 0.3 0.4")
+        # Lines whose class ID field (after optional leading blanks) is
+        # from_class as a whole field; zero-padded IDs such as "007" count
+        # as class 7, as int() parsing does
+        from_class_bytes = str(from_class).encode()
+        self._from_class_pattern = re.compile(rb'(?m)^([ \t]*)0*' + from_class_bytes + rb'(?=\s|$)')
+        self._to_class_bytes = rb'\g<1>' + str(to_class).encode()
 
-        Returns:
-            Tuple of (converted_line, was_converted)
-        """
-        parts = line.strip().split()
-        if not parts:
-            return line, False
-
-        try:
-            class_id = int(parts[0])
-            if class_id == self.from_class:
-                # Replace class ID while preserving coordinates
-                parts[0] = str(self.to_class)
-                return ' '.join(parts) + '\n', True
-            return line, False
-        except (ValueError, IndexError):
-            logger.warning(f"⚠️  Skipping malformed line: {line.strip()}")
-            return line, False
+        # Every match starts a line, follows a blank or follows padding
+        # zeros, so a file containing none of these can be skipped with
+        # plain substring searches
+        self._from_class_prefix = from_class_bytes
+        self._from_class_needles = tuple(sep + from_class_bytes for sep in (b'\n', b' ', b'\t', b'0'))
 
     def convert_file(self, annotation_path: Path) -> int:
         """
@@ -75,33 +65,44 @@ class AnnotationConverter:
         Returns:
             Number of lines converted in this file
         """
-        if not annotation_path.exists():
-            logger.warning(f"⚠️  File not found: {annotation_path}")
-            return 0
-
         try:
-            with open(annotation_path, 'r') as f:
-                lines = f.readlines()
-
-            converted_lines = []
-            file_conversions = 0
-
-            for line in lines:
-                converted_line, was_converted = self.convert_line(line)
-                converted_lines.append(converted_line)
-                if was_converted:
-                    file_conversions += 1
+            # Read without asking for write access, so files that need no
+            # change convert cleanly even when they're read-only
+            data = annotation_path.read_bytes()
+
+            # One regex pass over the raw bytes, and only when a cheap
+            # substring check says a match is possible; files without a
+            # match are never decoded or rewritten
+            if data.startswith(self._from_class_prefix) or any(needle in data for needle in self._from_class_needles):
+                converted, file_conversions = self._from_class_pattern.subn(self._to_class_bytes, data)
+            else:
+                converted, file_conversions = data, 0
+
+            # Same-width IDs (e.g. 10 → 20) are rewritten in place. Every
+            # line stays well-formed even if that write is interrupted; it's
+            # just not converted yet
+            in_place = file_conversions > 0 and not self.dry_run and len(converted) == len(data)
+            if in_place:
+                with open(annotation_path, 'r+b') as f:
+                    f.write(converted)
 
             if file_conversions > 0:
                 if self.dry_run:
                     logger.info(f"🔍 [DRY RUN] Would convert {file_conversions} lines in: {annotation_path.name}")
                 else:
-                    with open(annotation_path, 'w') as f:
-                        f.writelines(converted_lines)
+                    if not in_place:
+                        # Swap in a complete new file so an interrupted run
+                        # can't leave a half-written label file behind
+                        tmp_path = annotation_path.with_suffix('.txt.tmp')
+                        tmp_path.write_bytes(converted)
+                        os.replace(tmp_path, annotation_path)
                     logger.info(f"✅ Converted {file_conversions} lines in: {annotation_path.name}")
 
             return file_conversions
 
+        except FileNotFoundError:
+            logger.warning(f"⚠️  File not found: {annotation_path}")
+            return 0
         except Exception as e:
             logger.error(f"❌ Failed to convert {annotation_path}: {e}")
             return 0
@@ -120,12 +121,25 @@ class AnnotationConverter:
             logger.warning(f"⚠️  Directory not found: {directory}")
             return 0
 
-        annotation_files = list(directory.glob('*.txt'))
+        return self._convert_files(directory, list(directory.glob('*.txt')))
+
+    def _convert_files(self, directory: Path, annotation_files: List[Path]) -> int:
+        """
+        Convert a directory's .txt files
+
+        Args:
+            directory: Directory the files are in (for logging)
+            annotation_files: Annotation files to convert
+
+        Returns:
+            Total number of lines converted
+        """
         if not annotation_files:
             logger.info(f"📂 No .txt files found in: {directory}")
             return 0
 
         logger.info(f"📂 Processing {len(annotation_files)} files in: {directory}")
+        self.files_processed += len(annotation_files)
         total_conversions = 0
 
         for annotation_path in annotation_files:
@@ -154,19 +168,12 @@ class AnnotationConverter:
             logger.info(f"Processing base directory: {base_dir}")
             logger.info(f"{'='*60}")
 
-            # Process base directory itself
-            conversions = self.convert_directory(base_dir)
-            if conversions > 0:
-                self.lines_converted += conversions
-                self.files_processed += len(list(base_dir.glob('*.txt')))
-
-            # Process subdirectories recursively
-            for subdir in base_dir.rglob('*'):
-                if subdir.is_dir():
-                    conversions = self.convert_directory(subdir)
-                    if conversions > 0:
-                        self.lines_converted += conversions
-                        self.files_processed += len(list(subdir.glob('*.txt')))
+            # Process the base directory and every subdirectory, reading
+            # each directory once
+            for root, _dirs, files in os.walk(base_dir):
+                directory = Path(root)
+                annotation_files = [directory / name for name in files if name.endswith('.txt')]
+                self.lines_converted += self._convert_files(directory, annotation_files)
 
         logger.info(f"\n{'='*60}")
         logger.info(f"SUMMARY")
@@ -23,8 +23,12 @@ Usage:
 import argparse
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
+import threading
 import time
 import os
 from dotenv import load_dotenv
@@ -35,6 +39,19 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Concurrent image downloads
+DOWNLOAD_WORKERS = 4
+
+# Minimum gap between starting two image downloads, shared by all workers
+# (the same 0.2s pause the sequential downloader took between images)
+DOWNLOAD_INTERVAL = 0.2
+
+# Bytes read from the network per write when saving an image
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Transient HTTP statuses worth retrying (rate limiting, server hiccups)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
 
 class ImageFetcher:
     """Fetch images from free stock photo APIs"""
@@ -51,6 +68,32 @@ class ImageFetcher:
         
         if not self.api_key:
             logger.warning(f"⚠️  No API key found for {source}. See setup instructions below.")
+        
+        # One session for the API and image requests, so connections (and
+        # their TLS handshakes) are reused. The pool is sized for the
+        # download threads
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=DOWNLOAD_WORKERS,
+            pool_maxsize=DOWNLOAD_WORKERS,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=RETRY_STATUSES, raise_on_status=False)
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        
+        # Next time a download may start (see _wait_for_download_slot)
+        self._download_lock = threading.Lock()
+        self._next_download_at = 0.0
+    
+    def close(self):
+        """Close pooled connections"""
+        self._session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
     
     def _get_api_key(self) -> str:
         """Get API key from environment"""
@@ -91,7 +134,7 @@ class ImageFetcher:
                 'orientation': 'landscape'  # Better for object detection
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = self._session.get(url, headers=headers, params=params)
             
             if response.status_code != 200:
                 logger.error(f"❌ Pexels API error: {response.status_code}")
@@ -147,7 +190,7 @@ class ImageFetcher:
                 'orientation': 'landscape'
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = self._session.get(url, headers=headers, params=params)
             
             if response.status_code == 403:
                 logger.error("❌ Unsplash rate limit exceeded (50 requests/hour)")
@@ -208,7 +251,7 @@ class ImageFetcher:
                 'orientation': 'horizontal'
             }
             
-            response = requests.get(url, params=params)
+            response = self._session.get(url, params=params)
             
             if response.status_code != 200:
                 logger.error(f"❌ Pixabay API error: {response.status_code}")
@@ -273,35 +316,74 @@ class ImageFetcher:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
+        if not images:
+            return 0
+        
         downloaded = 0
         
-        for i, image in enumerate(images, 1):
-            try:
-                logger.info(f"📥 Downloading {i}/{len(images)}: {image['id']} from {image['source']}")
-                
-                response = requests.get(image['url'], timeout=30)
-                
-                if response.status_code == 200:
-                    # Generate filename
-                    filename = f"{self.source}_{query.replace(' ', '_')}_{image['id']}.jpg"
-                    filepath = output_dir / filename
-                    
-                    # Save image
-                    with open(filepath, 'wb') as f:
-                        f.write(response.content)
-                    
+        # Downloads are network-bound, so threads overlap them well. Request
+        # starts are still paced to one per DOWNLOAD_INTERVAL across all
+        # workers, so the image servers see the old request rate while slow
+        # transfers overlap
+        with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(images))) as executor:
+            futures = [executor.submit(self._download_image, image, output_dir, query) for image in images]
+            for i, future in enumerate(as_completed(futures), 1):
+                filename = future.result()
+                if filename:
                     downloaded += 1
-                    logger.info(f"✅ Saved: {filename}")
-                else:
+                    logger.info(f"✅ [{i}/{len(images)}] Saved: {filename}")
+        
+        return downloaded
+    
+    def _download_image(self, image: Dict, output_dir: Path, query: str) -> Optional[str]:
+        """
+        Download a single image (runs on a download thread)
+        
+        Args:
+            image: Image data from fetch_images()
+            output_dir: Output directory path
+            query: Search query (for filename generation)
+            
+        Returns:
+            Saved filename, or None if the download failed
+        """
+        # Generate filename
+        filename = f"{self.source}_{query.replace(' ', '_')}_{image['id']}.jpg"
+        filepath = output_dir / filename
+        part_path = filepath.with_suffix('.jpg.part')
+        
+        try:
+            self._wait_for_download_slot()
+            with self._session.get(image['url'], timeout=30, stream=True) as response:
+                if response.status_code != 200:
                     logger.warning(f"⚠️  Failed to download image {image['id']}: HTTP {response.status_code}")
+                    return None
                 
-                # Be nice to servers
-                time.sleep(0.2)
-                
-            except Exception as e:
-                logger.error(f"❌ Error downloading {image['id']}: {e}")
+                # Save image as it arrives rather than buffering the whole body,
+                # into a temp file so an image from an earlier run is only
+                # replaced by a complete download
+                with open(part_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+            
+            os.replace(part_path, filepath)
+            return filename
+            
+        except Exception as e:
+            logger.error(f"❌ Error downloading {image['id']}: {e}")
+            # Don't leave a truncated image behind for the annotation tool
+            part_path.unlink(missing_ok=True)
+            return None
+    
+    def _wait_for_download_slot(self):
+        """Block until this thread may start a download, at most one per DOWNLOAD_INTERVAL"""
+        with self._download_lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_download_at)
+            self._next_download_at = start_at + DOWNLOAD_INTERVAL
         
-        return downloaded
+        if start_at > now:
+            time.sleep(start_at - now)
 
 
 def print_setup_instructions():
@@ -426,45 +508,44 @@ Recommended queries for coffee mugs:
     
     # Create fetcher
     try:
-        fetcher = ImageFetcher(source=args.source)
-        
-        # Fetch images
-        logger.info("=" * 60)
-        logger.info(f"🚀 Fetching {args.count} images from {args.source.title()}")
-        logger.info("=" * 60)
-        
-        images = fetcher.fetch_images(args.query, args.count)
-        
-        if not images:
-            logger.error("❌ No images found. Try a different query.")
-            return
-        
-        logger.info(f"✅ Found {len(images)} images")
-        
-        # Download images
-        logger.info("")
-        logger.info("📥 Downloading images...")
-        downloaded = fetcher.download_images(images, args.output, args.query)
-        
-        logger.info("")
-        logger.info("=" * 60)
-        logger.info(f"✅ Downloaded {downloaded}/{len(images)} images to: {args.output}")
-        logger.info("=" * 60)
-        
-        if downloaded > 0:
+        with ImageFetcher(source=args.source) as fetcher:
+            # Fetch images
+            logger.info("=" * 60)
+            logger.info(f"🚀 Fetching {args.count} images from {args.source.title()}")
+            logger.info("=" * 60)
+            
+            images = fetcher.fetch_images(args.query, args.count)
+            
+            if not images:
+                logger.error("❌ No images found. Try a different query.")
+                return
+            
+            logger.info(f"✅ Found {len(images)} images")
+            
+            # Download images
+            logger.info("")
+            logger.info("📥 Downloading images...")
+            downloaded = fetcher.download_images(images, args.output, args.query)
+            
             logger.info("")
-            logger.info("🎯 Next steps:")
-            logger.info(f"   1. Review images in: {args.output}")
-            logger.info(f"   2. Run annotation tool: python backend/training/annotation_tool.py")
-            logger.info(f"   3. Annotate bounding boxes")
-            logger.info(f"   4. Click 'Add to Training Set' to copy to synthetic_training/")
-            
-            # Optionally open annotation tool
-            if args.annotate:
+            logger.info("=" * 60)
+            logger.info(f"✅ Downloaded {downloaded}/{len(images)} images to: {args.output}")
+            logger.info("=" * 60)
+            
+            if downloaded > 0:
                 logger.info("")
-                logger.info("🚀 Opening annotation tool...")
-                import subprocess
-                subprocess.run(['python', 'backend/training/annotation_tool.py'])
+                logger.info("🎯 Next steps:")
+                logger.info(f"   1. Review images in: {args.output}")
+                logger.info(f"   2. Run annotation tool: python backend/training/annotation_tool.py")
+                logger.info(f"   3. Annotate bounding boxes")
+                logger.info(f"   4. Click 'Add to Training Set' to copy to synthetic_training/")
+                
+                # Optionally open annotation tool
+                if args.annotate:
+                    logger.info("")
+                    logger.info("🚀 Opening annotation tool...")
+                    import subprocess
+                    subprocess.run(['python', 'backend/training/annotation_tool.py'])
         
     except ValueError as e:
         logger.error(f"❌ {e}")
@@ -13,6 +13,7 @@ Usage:
 import os
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Tuple
 
@@ -29,6 +30,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Blobs downloaded at once (the sync Azure client is thread-safe and
+# each download is mostly waiting on the network)
+DOWNLOAD_WORKERS = 8
+
 
 def get_blob_service_client() -> BlobServiceClient:
     """Get Azure Blob Storage client"""
@@ -87,15 +92,17 @@ def download_blob(
             blob=blob_name
         )
         
-        # Download blob data
+        # Stream blob data straight into the file rather than buffering it
         with open(output_path, "wb") as download_file:
-            download_file.write(blob_client.download_blob().readall())
+            blob_client.download_blob().readinto(download_file)
         
         logger.info(f"⬇️  Downloaded: {blob_name}")
         return True
         
     except Exception as e:
         logger.error(f"❌ Failed to download {blob_name}: {e}")
+        # A partial file would be skipped as "already exists" on the next run
+        output_path.unlink(missing_ok=True)
         return False
 
 
@@ -130,6 +137,34 @@ def delete_blob(
         return False
 
 
+def fetch_one_photo(
+    blob_service_client: BlobServiceClient,
+    container_name: str,
+    blob_name: str,
+    output_dir: Path,
+    delete_after_download: bool = False
+) -> Tuple[bool, bool]:
+    """
+    Download one blob and optionally delete it
+    
+    Args:
+        blob_service_client: Azure Blob Storage client
+        container_name: Name of the container
+        blob_name: Name of the blob to fetch
+        output_dir: Directory to save the photo in
+        delete_after_download: If True, delete the blob once it's saved locally
+    
+    Returns:
+        Tuple of (downloaded, deleted)
+    """
+    if not download_blob(blob_service_client, container_name, blob_name, output_dir / blob_name):
+        return False, False
+    
+    # Delete from cloud if requested
+    deleted = delete_after_download and delete_blob(blob_service_client, container_name, blob_name)
+    return True, deleted
+
+
 def fetch_retraining_photos(
     output_dir: Path,
     delete_after_download: bool = False
@@ -164,32 +199,40 @@ def fetch_retraining_photos(
         logger.info(f"📦 Found {len(blob_names)} photo(s) in cloud storage")
         logger.info(f"📁 Downloading to: {output_dir.absolute()}")
         
-        downloaded_count = 0
-        deleted_count = 0
+        # Skip photos that already exist locally, checked against one
+        # listing of the output directory. Blob names with a "/" live in a
+        # subdirectory that listing doesn't cover, so those are checked
+        # individually
+        with os.scandir(output_dir) as entries:
+            existing = {entry.name for entry in entries}
+        is_local = {
+            blob_name: (output_dir / blob_name).exists() if '/' in blob_name else blob_name in existing
+            for blob_name in blob_names
+        }
+        to_download = [blob_name for blob_name in blob_names if not is_local[blob_name]]
+        already_local = [blob_name for blob_name in blob_names if is_local[blob_name]]
+        
+        if already_local:
+            logger.info(f"⏭️  Skipping {len(already_local)} photo(s) (already exist locally)")
         
-        # Download each blob
-        for blob_name in blob_names:
-            output_path = output_dir / blob_name
+        # Download the blobs concurrently; each round-trip is mostly waiting
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            results = executor.map(
+                lambda blob_name: fetch_one_photo(
+                    blob_service_client, container_name, blob_name, output_dir, delete_after_download
+                ),
+                to_download
+            )
             
-            # Skip if file already exists locally
-            if output_path.exists():
-                logger.info(f"⏭️  Skipping {blob_name} (already exists locally)")
-                
-                # Still delete from cloud if requested
-                if delete_after_download:
-                    if delete_blob(blob_service_client, container_name, blob_name):
-                        deleted_count += 1
-                
-                continue
+            # Photos we already had are still deleted from cloud if requested
+            local_deletes = executor.map(
+                lambda blob_name: delete_blob(blob_service_client, container_name, blob_name),
+                already_local if delete_after_download else []
+            )
             
-            # Download blob
-            if download_blob(blob_service_client, container_name, blob_name, output_path):
-                downloaded_count += 1
-                
-                # Delete from cloud if requested
-                if delete_after_download:
-                    if delete_blob(blob_service_client, container_name, blob_name):
-                        deleted_count += 1
+            results = list(results)
+            downloaded_count = sum(downloaded for downloaded, _ in results)
+            deleted_count = sum(deleted for _, deleted in results) + sum(local_deletes)
         
         return downloaded_count, deleted_count
         
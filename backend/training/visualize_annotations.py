@@ -17,6 +17,9 @@ from PIL import Image, ImageDraw, ImageFont
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Image file extensions to visualize (lowercase)
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.webp'})
+
 class AnnotationVisualizer:
     """Visualizes YOLO annotations by drawing boxes on images"""
     
@@ -198,11 +201,9 @@ class AnnotationVisualizer:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Find all image files
-        image_extensions = ['.jpg', '.jpeg', '.png', '.webp']
-        image_files = []
-        for ext in image_extensions:
-            image_files.extend(input_dir.glob(f'*{ext}'))
+        # Find all image files in one directory pass (case-insensitive extensions)
+        image_files = [path for path in input_dir.iterdir()
+                       if path.suffix.lower() in IMAGE_EXTENSIONS and path.is_file()]
         
         if not image_files:
             logger.error(f"No images found in {input_dir}")
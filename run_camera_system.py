@@ -23,7 +23,7 @@ from PIL import Image
 # Add project root to path
 sys.path.append(str(Path(__file__).parent))
 
-from backend.shared_camera import SharedCameraManager
+from backend.shared_camera import get_shared_camera
 from backend.detection.detector import YOLODetector
 from backend.api.live_stream import LiveCameraManager
 from backend.api.main import app
@@ -119,7 +119,7 @@ def main():
     try:
         # 1. Start shared camera
         logger.info("🔗 Starting shared camera...")
-        shared_camera = SharedCameraManager()
+        shared_camera = get_shared_camera()
         shared_camera.start()  # Start the camera immediately
         
         # 2. Start cleanup service